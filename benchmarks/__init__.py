@@ -0,0 +1,141 @@
+'''
+Microbenchmarks for ParamPy.
+
+Benchmarks are registered using the :func:`benchmark` decorator, which is
+applied to a function that performs any necessary setup and then returns the
+(zero-argument) callable to be timed. The suite can be run from the root of
+the repository using:
+
+	$ python -m benchmarks
+
+See `python -m benchmarks --help` for the available options, which include
+writing the results as JSON, and comparing them against a stored baseline.
+'''
+
+import json
+import platform
+import re
+import timeit
+
+BENCHMARKS = []
+
+# The default fractional increase in runtime (relative to the baseline) which
+# is considered to be a regression.
+DEFAULT_THRESHOLD = 0.25
+
+
+def benchmark(name, threshold=None, number=None, repeat=5):
+	'''
+	benchmark(name, threshold=None, number=None, repeat=5)
+
+	:param name: The name of the benchmark, conventionally of form `<component>.<operation>`.
+	:type name: str
+	:param threshold: The fractional increase in runtime relative to the baseline which is considered to be a regression (overriding the threshold passed to :func:`compare`).
+	:type threshold: float
+	:param number: The number of calls per timing (determined automatically if :python:`None`).
+	:type number: int
+	:param repeat: The number of timings to take.
+	:type repeat: int
+
+	A decorator which registers a benchmark. For example:
+
+	>>> @benchmark('parameters.attribute')
+	>>> def attribute():
+	>>> 	p = Parameters()
+	>>> 	p.x = 1
+	>>> 	return lambda: p.x
+	'''
+	def register(setup):
+		BENCHMARKS.append({'name': name, 'setup': setup, 'threshold': threshold, 'number': number, 'repeat': repeat})
+		return setup
+	return register
+
+
+def calibrate(f, target=0.05):
+	'''
+	calibrate(f, target=0.05)
+
+	:returns: The number of calls to `f` which take at least `target` seconds.
+	'''
+	number = 1
+	while True:
+		if timeit.timeit(f, number=number) >= target or number >= 10 ** 7:
+			return number
+		number *= 10
+
+
+def run(pattern=None, stream=None):
+	'''
+	run(pattern=None, stream=None)
+
+	:param pattern: A regular expression which the names of the benchmarks to run must match (all are run if :python:`None`).
+	:type pattern: str
+	:param stream: A file-like object to which progress should be written (if not :python:`None`).
+	:type stream: file
+
+	:returns: A dictionary of results suitable for serialisation as JSON.
+	'''
+	results = {}
+	for spec in BENCHMARKS:
+		if pattern is not None and not re.search(pattern, spec['name']):
+			continue
+		f = spec['setup']()
+		number = spec['number'] or calibrate(f)
+		timings = sorted(t / number for t in timeit.repeat(f, number=number, repeat=spec['repeat']))
+		results[spec['name']] = {
+			'min': timings[0],
+			'median': timings[len(timings) // 2],
+			'number': number,
+			'repeat': spec['repeat'],
+		}
+		if stream is not None:
+			stream.write("%-40s %12.3f us\n" % (spec['name'], timings[0] * 1e6))
+	return {'meta': metadata(), 'results': results}
+
+
+def metadata():
+	import numpy
+	import parampy
+	return {
+		'python': platform.python_version(),
+		'numpy': numpy.__version__,
+		'parampy': parampy.__version__,
+		'platform': platform.platform(),
+	}
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+	'''
+	compare(results, baseline, threshold=DEFAULT_THRESHOLD)
+
+	:param results: The results of :func:`run`.
+	:type results: dict
+	:param baseline: The (stored) results of a previous call to :func:`run`.
+	:type baseline: dict
+	:param threshold: The fractional increase in the minimum runtime of a benchmark which is considered to be a regression, unless otherwise specified for that benchmark.
+	:type threshold: float
+
+	:returns: A list of tuples of the name, baseline time, current time and ratio of the two for each regressed benchmark.
+
+	Benchmarks which are absent from either the results or the baseline are ignored.
+	'''
+	thresholds = dict((spec['name'], spec['threshold']) for spec in BENCHMARKS if spec['threshold'] is not None)
+	regressions = []
+	for name, result in sorted(results['results'].items()):
+		if name not in baseline['results']:
+			continue
+		before = baseline['results'][name]['min']
+		ratio = result['min'] / before
+		if ratio > 1 + thresholds.get(name, threshold):
+			regressions.append((name, before, result['min'], ratio))
+	return regressions
+
+
+def load(filename):
+	with open(filename) as f:
+		return json.load(f)
+
+
+def save(results, filename):
+	with open(filename, 'w') as f:
+		json.dump(results, f, indent=4, sort_keys=True, separators=(',', ': '))
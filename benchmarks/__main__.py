@@ -0,0 +1,51 @@
+'''
+Runs the ParamPy benchmark suite. For example:
+
+	$ python -m benchmarks --output results.json --baseline benchmarks/baseline.json
+
+exits with a non-zero status if any benchmark is slower than in the baseline
+by more than the regression threshold. To update the stored baseline, use:
+
+	$ python -m benchmarks --save-baseline benchmarks/baseline.json
+
+Baselines are only meaningful on the machine on which they were recorded.
+'''
+
+import argparse
+import json
+import sys
+
+import benchmarks
+from benchmarks import suite
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Run the ParamPy benchmark suite.")
+	parser.add_argument('-k', '--filter', default=None, help="Only run benchmarks whose names match this regular expression.")
+	parser.add_argument('-o', '--output', default=None, help="Write the results as JSON to this file ('-' for stdout).")
+	parser.add_argument('-b', '--baseline', default=None, help="Compare the results against the baseline stored in this JSON file.")
+	parser.add_argument('-t', '--threshold', type=float, default=benchmarks.DEFAULT_THRESHOLD, help="The fractional increase in runtime considered to be a regression (default: %(default)s).")
+	parser.add_argument('--save-baseline', default=None, metavar='FILENAME', help="Store the results as a new baseline in this JSON file.")
+	args = parser.parse_args(argv)
+
+	results = benchmarks.run(pattern=args.filter, stream=sys.stderr)
+
+	if args.output == '-':
+		json.dump(results, sys.stdout, indent=4, sort_keys=True, separators=(',', ': '))
+		sys.stdout.write('\n')
+	elif args.output is not None:
+		benchmarks.save(results, args.output)
+	if args.save_baseline is not None:
+		benchmarks.save(results, args.save_baseline)
+
+	if args.baseline is not None:
+		regressions = benchmarks.compare(results, benchmarks.load(args.baseline), threshold=args.threshold)
+		for name, before, after, ratio in regressions:
+			sys.stderr.write("REGRESSION: %s took %.3f us (baseline %.3f us; %.2fx)\n" % (name, after * 1e6, before * 1e6, ratio))
+		if regressions:
+			return 1
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
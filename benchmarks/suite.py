@@ -0,0 +1,235 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import atexit
+
+import numpy as np
+
+from parampy import Parameters, SIUnitDispenser, SIQuantity, Units, units
+from parampy.iteration import RangesIterator
+
+from . import benchmark
+
+
+def parameters():
+	p = Parameters()
+	p(x=1e23, y=2, z=3, a=1, b=2, c=3, d=2)
+	return p
+
+
+############# PARAMETER EXTRACTION ############################################
+
+@benchmark('parameters.attribute')
+def attribute():
+	p = parameters()
+	return lambda: p.x
+
+
+@benchmark('parameters.call')
+def call():
+	p = parameters()
+	return lambda: p('x')
+
+
+@benchmark('parameters.call_scaled')
+def call_scaled():
+	p = parameters()
+	p.x = (1, 'ms')
+	return lambda: p('_x')
+
+
+@benchmark('parameters.override')
+def override():
+	p = parameters()
+	return lambda: p('x', x=1)
+
+
+@benchmark('parameters.overrides')
+def overrides():
+	p = parameters()
+	return lambda: p('x', x=1, y=2, z=3, a=1, b=2, c=3, d=2)
+
+
+############# FUNCTIONAL PARAMETERS ###########################################
+
+@benchmark('parameters.function')
+def function():
+	p = parameters()
+	p.y = lambda x: x ** 2
+	return lambda: p('y')
+
+
+@benchmark('parameters.function_override')
+def function_override():
+	p = parameters()
+	p.y = lambda x: x ** 2
+	return lambda: p('y', x=10)
+
+
+@benchmark('parameters.function_inverse')
+def function_inverse():
+	p = parameters()
+	p << {'y': lambda x, y=None: x ** 2 if y is None else (y ** 0.5,)}
+	return lambda: p('x', y=4)
+
+
+@benchmark('parameters.sympy')
+def sympy_function():
+	p = parameters()
+	p.y = 'x^2'
+	return lambda: p('y')
+
+
+@benchmark('parameters.expression')
+def expression():
+	p = parameters()
+	return lambda: p('x^2 + y^2')
+
+
+@benchmark('parameters.optimised')
+def optimised():
+	p = parameters()
+	o = p.optimise('x^2')
+	return lambda: p(o)
+
+
+@benchmark('parameters.cached')
+def cached():
+	p = parameters()
+	p.y = lambda _x: _x ** 2
+	p.cache(y=True)
+	return lambda: p('_y', x=2)
+
+
+@benchmark('parameters.chain')
+def chain():
+	p = Parameters()
+	p.a0 = 1
+	for i in range(1, 20):
+		p << {'a%d' % i: eval('lambda a%d: a%d + 1' % (i - 1, i - 1))}
+	return lambda: p('a19')
+
+
+############# BOUNDS ##########################################################
+
+@benchmark('parameters.bounds_set')
+def bounds_set():
+	p = parameters()
+	p.y = lambda x: x ** 2
+	p.set_bounds({'x': (0, 10)})
+	return lambda: p(x=5)
+
+
+@benchmark('parameters.bounds_override')
+def bounds_override():
+	p = parameters()
+	p.y = lambda x: x ** 2
+	p.set_bounds({'x': (0, 10)})
+	return lambda: p('y', x=5)
+
+
+############# RANGES ##########################################################
+
+@benchmark('parameters.range')
+def range_():
+	p = parameters()
+	p.y = lambda x: x ** 2
+	return lambda: p.range('y', x=(0, 1, 100))
+
+
+@benchmark('parameters.range_vectorised')
+def range_vectorised():
+	p = parameters()
+	p.y = lambda x: x ** 2
+	return lambda: p.range_vectorised('_y', x=(0, 1, 100))
+
+
+@benchmark('iteration.ranges_expand')
+def ranges_expand():
+	p = parameters()
+	p.y = lambda x: x ** 2
+	iterator = RangesIterator(p, [{'x': (0, 1, 10)}, {'z': (0, 1, 10)}], progress=False)
+	return iterator.ranges_expand
+
+
+############# UNITS AND QUANTITIES ############################################
+
+@benchmark('units.parse')
+def units_parse():
+	ud = SIUnitDispenser()
+	return lambda: Units('kg*m^2/s^2', dispenser=ud)
+
+
+@benchmark('units.parse_uncached')
+def units_parse_uncached():
+	ud = SIUnitDispenser()
+	strings = ['m', 'kg*m^2/s^2', 'J/(kg*K)', '/nm', 'mW/cm^2', '(m/s)^2', 'm^(1/2)', '1000*m', 'GHz', 'kg^2/s*m']
+	def parse():
+		for string in strings:
+			Units(units._parse_units(string, ud), dispenser=ud)
+	return parse
+
+
+@benchmark('units.dispenser_init')
+def units_dispenser_init():
+	return SIUnitDispenser
+
+
+@benchmark('units.dispenser')
+def units_dispenser():
+	ud = SIUnitDispenser()
+	return lambda: ud('kg*m^2/s^2')
+
+
+@benchmark('units.scale')
+def units_scale():
+	ud = SIUnitDispenser()
+	kmh, ms = ud('km/hour'), ud('m/s')
+	return lambda: kmh.scale(ms)
+
+
+@benchmark('units.scale_context')
+def units_scale_context():
+	ud = SIUnitDispenser()
+	J, rad_s = ud('J'), ud('rad/s')
+	return lambda: ud.scale(J.dimensions, rad_s.dimensions, context='cm')
+
+
+@benchmark('quantity.add')
+def quantity_add():
+	a, b = SIQuantity(1, 'm'), SIQuantity(1, 'nm')
+	return lambda: a + b
+
+
+@benchmark('quantity.multiply')
+def quantity_multiply():
+	a, b = SIQuantity(1, 'm'), SIQuantity(2, 's')
+	return lambda: a * b
+
+
+@benchmark('quantity.ufunc')
+def quantity_ufunc():
+	a = SIQuantity(np.linspace(0, 1, 100), 'm^2')
+	return lambda: np.sqrt(a)
+
+
+############# LOADING #########################################################
+
+@benchmark('parameters.load', threshold=0.5)
+def load():
+	directory = tempfile.mkdtemp()
+	atexit.register(shutil.rmtree, directory)
+	filename = os.path.join(directory, 'profile.json')
+	p = parameters()
+	p.w = (np.linspace(0, 1, 10000), 'm')
+	p.v = 'w*x'
+	p >> filename
+	return lambda: Parameters.load(filename)
+
+
+@benchmark('parampy.import', threshold=0.5, number=1, repeat=3)
+def import_():
+	command = [sys.executable, '-c', 'import parampy']
+	return lambda: subprocess.check_call(command)
@@ -2,11 +2,16 @@ __author__ = 'Matthew Wardrop'
 __author_email__ = 'mister.wardrop@gmail.com'
 __version__ = '2.1.1'
 
-import pyximport; pyximport.install()
+# Use extensions compiled ahead of time (using `python setup.py build_ext`)
+# where available, and otherwise compile them on import using pyximport.
+try:
+	from . import errors, units, quantities, parameters
+except ImportError:
+	import pyximport; pyximport.install()
 
 import numpy as np
 
 from .quantities import Quantity
 from .units import UnitDispenser, Units, Unit
 from .definitions import SIUnitDispenser, SIQuantity
-from .parameters import Parameters, Bounds
+from .parameters import Parameters, Bounds, Statistics
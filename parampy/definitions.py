@@ -5,14 +5,58 @@ import math
 from .units import UnitDispenser, Unit
 from .quantities import Quantity
 
+# Conversion maps and scalings are defined at the module level (rather than
+# as lambda functions) so that dispensers which use them can be pickled.
+
+def _decibel_to_ratio(v):
+	return 10**(v/10.)
+
+def _ratio_to_decibel(v):
+	return 10*math.log(v,10)
+
+def _fahrenheit_to_celsius(f):
+	return (f - 32)*5./9
+
+def _fahrenheit_to_kelvin(f):
+	return (f + 459.67)*5./9
+
+def _fahrenheit_to_celsius_delta(f):
+	return f*5./9
+
+def _celsius_to_fahrenheit(c):
+	return c*9./5 + 32
+
+def _celsius_to_kelvin(c):
+	return c +  273.15
+
+def _celsius_to_fahrenheit_delta(c):
+	return c*9./5
+
+def _celsius_to_kelvin_delta(c):
+	return c
+
+def _fahrenheit_to_kelvin_delta(f):
+	return f*5./9
+
+def _energy_to_frequency(hbar):
+	return 1./2/math.pi/hbar
+
 class SIUnitDispenser(UnitDispenser):
 	'''
 	A subclass of :class:`UnitDispenser` which prepopulates the unit dispenser
 	with SI units and some common other units. For a complete list of supported
 	units, please see the "Supported Units" chapter of the python-parameters
 	documentation.
+
+	The SI unit tables are built once per process (when the first instance is
+	created), and shared by all instances until they are modified (for example,
+	by adding units or contexts, or by changing the basis); and so creating
+	new instances is cheap. Instances of subclasses build their own tables,
+	unless the subclass also sets `_shared_tables`.
 	'''
 
+	_shared_tables = True
+
 	def init_prefixes(self):
 		'''
 		This method is called by the :class:`UnitDispenser` constructor, at which
@@ -65,8 +109,8 @@ class SIUnitDispenser(UnitDispenser):
 		self \
 			+ Unit("decibel", "dB", 1.0)
 
-		self.add_conversion_map("dB", "", lambda v: 10**(v/10.))
-		self.add_conversion_map("", "dB", lambda v: 10*math.log(v,10))
+		self.add_conversion_map("dB", "", _decibel_to_ratio)
+		self.add_conversion_map("", "dB", _ratio_to_decibel)
 
 		# Angular units
 		self \
@@ -139,19 +183,19 @@ class SIUnitDispenser(UnitDispenser):
 			+ Unit("fahrenheit", [u"°F","degF"], 9./5).set_dimensions(temperature=1) \
 			+ Unit("celsius", [u"°C","degC"], 1.).set_dimensions(temperature=1)
 
-		self.add_conversion_map('fahrenheit','celsius',lambda f: (f - 32)*5./9, absolute=True)
-		self.add_conversion_map('fahrenheit','kelvin',lambda f: (f + 459.67)*5./9, absolute=True)
-		self.add_conversion_map('fahrenheit','celsius',lambda f: f*5./9, absolute=False)
-		self.add_conversion_map('fahrenheit','kelvin',lambda f: f*5./9, absolute=False)
+		self.add_conversion_map('fahrenheit','celsius',_fahrenheit_to_celsius, absolute=True)
+		self.add_conversion_map('fahrenheit','kelvin',_fahrenheit_to_kelvin, absolute=True)
+		self.add_conversion_map('fahrenheit','celsius',_fahrenheit_to_celsius_delta, absolute=False)
+		self.add_conversion_map('fahrenheit','kelvin',_fahrenheit_to_kelvin_delta, absolute=False)
 
-		self.add_conversion_map('celsius','fahrenheit',lambda c: c*9./5 + 32, absolute=True)
-		self.add_conversion_map('celsius','kelvin',lambda c: c +  273.15, absolute=True)
-		self.add_conversion_map('celsius','fahrenheit',lambda c: c*9./5, absolute=False)
-		self.add_conversion_map('celsius','kelvin',lambda c: c, absolute=False)
+		self.add_conversion_map('celsius','fahrenheit',_celsius_to_fahrenheit, absolute=True)
+		self.add_conversion_map('celsius','kelvin',_celsius_to_kelvin, absolute=True)
+		self.add_conversion_map('celsius','fahrenheit',_celsius_to_fahrenheit_delta, absolute=False)
+		self.add_conversion_map('celsius','kelvin',_celsius_to_kelvin_delta, absolute=False)
 
 		self.add_context("cm", hbar=1.05457173e-34)
 
-		self.add_scaling({'mass':1,'length':2,'time':-2}, {'time':-1}, lambda hbar: 1./2/math.pi/hbar, context="cm")
+		self.add_scaling({'mass':1,'length':2,'time':-2}, {'time':-1}, _energy_to_frequency, context="cm")
 
 class SIQuantity(Quantity):
 	'''
@@ -26,6 +26,10 @@ class ParameterRecursionError(ParametersException):
 	pass
 
 
+class ParameterFrozenError(ParametersException):
+	pass
+
+
 class ParameterNameWarning(UserWarning):
 	pass
 
@@ -34,6 +38,10 @@ class ParameterInconsistentWarning(UserWarning):
 	pass
 
 
+class ParameterNotSavedWarning(UserWarning):
+	pass
+
+
 # Bound Errors
 class ParameterOutsideBoundsWarning(UserWarning):
 	pass
@@ -3,6 +3,7 @@ import threading
 import resource
 import datetime
 import types
+from multiprocessing import current_process
 
 import numpy as np
 
@@ -388,7 +389,10 @@ class RangesIterator(object):
 			ranges_eval.fill(np.nan)
 		else:
 			final_shape = ranges_eval.shape + (size,)
-			ranges_eval = np.array(np.repeat(ranges_eval, size).reshape(final_shape), dtype=ranges_eval.dtype.descr + dtype_delta)
+			repeated = np.repeat(ranges_eval, size).reshape(final_shape)
+			ranges_eval = np.empty(final_shape, dtype=ranges_eval.dtype.descr + dtype_delta)
+			for label in repeated.dtype.names:
+				ranges_eval[label] = repeated[label]
 		for label in labels:
 			ranges_eval[label].fill(np.nan)
 		return ranges_eval
@@ -424,9 +428,12 @@ class RangesIterator(object):
 
 		elif self.nprocs not in [0, 1] and self.function is not None:
 			from .utility.symmetric import AsyncParallelMap
-			apm = AsyncParallelMap(self.function, progress=self.progress, nprocs=self.nprocs, spawnonce=True)
+			# Worker processes are forked, and so inherit the wrapped function (along
+			# with the parameter context); and so only the index of each iteration is
+			# sent through the task queue (see `IndexedFunction`).
+			apm = AsyncParallelMap(IndexedFunction(self.function, self.params, ranges_eval, self.function_args, self.function_kwargs), progress=self.progress, nprocs=self.nprocs, spawnonce=True)
 
-			for res in apm.iterate([(i, self.function_args, {'params':self.__get_params_for_index(i, ranges_eval)}) for i in indices], count_offset=0, count_total=len(indices), start_time=start_time, base_kwargs=self.function_kwargs):
+			for res in apm.iterate([(i, (i,), {}) for i in indices], count_offset=0, count_total=len(indices), start_time=start_time):
 				yield res
 		else:
 			for i, index in enumerate(indices):
@@ -465,3 +472,55 @@ class RangesIterator(object):
 			sys.stderr.write('\n')
 
 		sys.stderr.flush()
+
+
+class IndexedFunction(object):
+	'''
+	IndexedFunction(function, params, ranges_eval, function_args=(), function_kwargs={})
+
+	A callable wrapper around the function called at each iteration of a
+	:class:`RangesIterator`, which is called with only the index of the
+	iteration. The parameter context, the evaluated ranges and the arguments of
+	the function are stored by the wrapper. Since the worker processes of
+	multiprocess sweeps are forked, they inherit the wrapper from the parent
+	process; and so only the index of each iteration is sent through the task
+	queue. (Distributed sweeps using dispy do not use this wrapper, and still
+	send the full parameter context with every task.)
+
+	:param function: The function to call at each iteration.
+	:type function: callable
+	:param params: The parameter context upon which the ranges are superimposed.
+	:type params: dict
+	:param ranges_eval: The evaluated ranges (see :func:`RangesIterator.ranges_eval`).
+	:type ranges_eval: numpy.ndarray
+	:param function_args: The positional arguments to pass to the function.
+	:type function_args: tuple
+	:param function_kwargs: The keyword arguments to pass to the function.
+	:type function_kwargs: dict
+
+	>>> f = IndexedFunction(lambda params: params['x'], {}, iterator.ranges_eval)
+	>>> f((0,))
+	0.0
+	'''
+
+	def __init__(self, function, params, ranges_eval, function_args=(), function_kwargs={}):
+		self.function = function
+		self.params = params
+		self.ranges_eval = ranges_eval
+		self.function_args = function_args
+		self.function_kwargs = function_kwargs
+
+	def params_for_index(self, index):
+		'''
+		params_for_index(index)
+
+		:returns: The parameter context for the iteration with index `index`.
+		'''
+		params = self.params.copy()
+		values = self.ranges_eval[index]
+		for i, param in enumerate(self.ranges_eval.dtype.names):
+			params[param] = values[i]
+		return params
+
+	def __call__(self, index):
+		return self.function(*self.function_args, params=self.params_for_index(index), **self.function_kwargs)
@@ -7,18 +7,102 @@ from .iteration import RangesIterator
 from .quantities import Quantity
 from .text import colour_text
 from .units import Units, Unit
+from .utility.cache import LRUCache, LockedLRUCache, ArrayKey, freeze_key
 from .utility.compat import str_types
 
+from fractions import Fraction
+from timeit import default_timer
+import contextlib
 import copy
-import imp
-import inspect
+import json
 import numpy as np
+import os
+import pickle
 import re
-import sympy
-import sympy.abc
+import tempfile
 import types
 import warnings
 
+# Opcodes for compiled evaluation plans (see `Parameters.__compile_plan`)
+_PLAN_STORED = 0
+_PLAN_OVERRIDE = 1
+_PLAN_FUNCTION = 2
+_PLAN_CONVERT = 3
+_PLAN_CONSTANT = 4
+
+# The default number of entries remembered for each cached function parameter
+_CACHE_CAPACITY = 128
+_CACHE_MISSING = object()
+_CONTEXT_MISSING = object()
+_LAMBDIFY_MODULES = ['numpy', 'mpmath', 'math', 'sympy']
+
+# Flags of function code objects (as in the `inspect` module)
+_CO_VARARGS = 0x04
+_CO_VARKEYWORDS = 0x08
+
+# SymPy is slow to import, and is only needed for symbolic expressions; and so
+# it is only imported upon first use (see `_sympy`).
+sympy = None
+
+
+def _sympy():
+	'''
+	Returns the `sympy` module, importing it (along with the submodules used by
+	Parameters) if this has not already been done.
+	'''
+	global sympy
+	if sympy is None:
+		import sympy.abc
+		import sympy.printing.lambdarepr
+	return sympy
+
+# The names available to functions generated by `Parameters.compile` (see
+# `_lambdify_namespace`)
+_LAMBDIFY_NAMESPACE = None
+
+
+def _lambdify_namespace():
+	'''
+	Returns a new dictionary of the names that `from <module> import *` would
+	import from each of the modules in `_LAMBDIFY_MODULES`, along with the
+	modules themselves. Earlier modules take precedence, as in `sympy.lambdify`.
+	'''
+	global _LAMBDIFY_NAMESPACE
+	if _LAMBDIFY_NAMESPACE is None:
+		_sympy()
+		namespace = {}
+		for name in reversed(_LAMBDIFY_MODULES):
+			module = __import__(name)
+			names = getattr(module, '__all__', None)
+			if names is None:
+				names = [key for key in dir(module) if key[:1] != '_']
+			namespace.update((key, getattr(module, key)) for key in names if hasattr(module, key))
+			namespace[name] = module
+		_LAMBDIFY_NAMESPACE = namespace
+	return dict(_LAMBDIFY_NAMESPACE)
+
+# Array values with more elements than this are saved in `.npy` files alongside
+# profiles, rather than inline (see `Parameters.__save__`)
+_SIDECAR_SIZE = 64
+
+# Attribute names of Parameters classes, which cannot be used as parameter names
+# with the attribute notation (see `Parameters.__set`)
+_RESERVED_NAMES = {}
+
+
+def _cache_key(value):
+	'''
+	Returns a hashable representation of a parameter value for use in function
+	caches, or raises a TypeError if no such representation exists.
+	'''
+	if isinstance(value, np.ndarray):
+		return ArrayKey(value)
+	if isinstance(value, Quantity):
+		return (_cache_key(value.value), value.units, value.absolute)
+	hash(value)
+	return value
+
+
 
 class Parameters(object):
 	"""
@@ -282,10 +366,10 @@ class Parameters(object):
 
 		To save your existing parameters, use:
 
-		p >> "filename.py"
+		p >> "filename.json"
 
-		Note that parameters that are dependent on other parameters will not survive
-		this transition, and will be saved as static values.
+		Note that parameters defined by symbolic expressions are saved as such,
+		but parameters defined by Python functions cannot be saved, and are omitted.
 
 	Parameter Contexts:
 		Parameters objects support Python's "with" syntax. Upon exiting a "with"
@@ -295,6 +379,9 @@ class Parameters(object):
 		>>> with p:
 		>>> 	p(x=1)
 		>>> p('x') # Returns value of x before entering the with environment.
+
+		Independent copies of a Parameters instance can be cheaply created using
+		:func:`copy`.
 	"""
 
 	def __init__(self, dispenser=None, default_scaled=True, constants=False):
@@ -306,12 +393,26 @@ class Parameters(object):
 		self.__units_custom = []
 		self.__default_scaled = default_scaled
 
-		self.__cache_deps = {}
-		self.__cache_sups = {}
+		self.__graph_deps = {}
+		self.__graph_sups = {}
+
 		self.__cache_scaled = {}
 		self.__cache_funcs = {}
+		self.__cache_plans = {}
+		self.__cache_plans_index = {}
 
 		self.__scaling_cache = {}
+		self.__cache_bounds = {}
+		self.__cache_exprs = LRUCache(_CACHE_CAPACITY)
+		self.__cache_analysis = LRUCache(_CACHE_CAPACITY)
+
+		self.__context_layers = []
+		self.__frozen = False
+
+		self.__stats = None  # The active Statistics instance, if any (see `stats`)
+		self.__stats_data = Statistics()
+		self.__shared = False
+		self.__units_shared = False # Whether the unit dispenser is shared with copies (see `copy`)
 
 		if constants and isinstance(self.__units, SIUnitDispenser):
 			self(**physical_constants.constants)
@@ -354,10 +455,13 @@ class Parameters(object):
 				raise ValueError("Invalid unit type to add: %s" % args[0])
 		else:
 			unit = Unit(*args, **kwargs)
+		self.__record('units', 'dispenser')
+		self.__record('units_custom', 'count')
 		self.__units.add(unit)
 		self.__units_custom.append(unit)
 
 	def set_units_context(self, *name, **params):
+		self.__record('units', 'dispenser')
 		self.__units.set_context(*name,**params)
 
 	@property
@@ -398,11 +502,15 @@ class Parameters(object):
 		1 s
 		'''
 		self.__scaling_cache = {}
+		if kwargs:
+			self.__cache_scaled = {}
+			self.__cache_bounds = {}
 
 		for arg in kwargs:
 			if arg in self.__units.dimensions:
 				scale = self.__get_quantity(kwargs[arg], param=arg)
 				if scale.units.dimensions == {arg: 1}:
+					self.__record('scalings', arg)
 					self.__scalings[arg] = scale
 				else:
 					raise errors.ScalingUnitInvalidError("Dimension of scaling (%s) is wrong for %s." % (scale.units, arg))
@@ -456,45 +564,305 @@ class Parameters(object):
 		raise errors.UnitInvalidError("No coercion for %s to Units." % unit)
 
 	################## ENABLE USE WITH 'with' ####################################
+	# Entering a context pushes an (initially empty) journal layer. Whenever a
+	# parameter, unit specification, bound or scaling is modified, its previous
+	# value is recorded in the top-most layer (the first time only); and upon
+	# exiting the context, only these entries are restored and invalidated.
+	# Copies of Parameters instances (see `copy`) share their internal state
+	# until one of them is modified, at which point it takes a private copy.
 
 	def __enter__(self):
-		try:
-			self.__context_save
-		except:
-			self.__context_save = []
-
-		self.__context_save.append({
-			'parameters_spec': copy.copy(self.__parameters_spec),
-			'parameters': copy.copy(self.__parameters),
-			'parameters_bounds': copy.copy(self.__parameters_bounds),
-			'scalings': copy.copy(self.__scalings),
-			'units': copy.copy(self.__units),
-			'units_custom': copy.copy(self.__units_custom),
-			'default_scaled': copy.copy(self.__default_scaled),
-		})
+		self.__context_layers.append({})
 
 	def __exit__(self, type, value, traceback):
 
-		context = self.__context_save.pop()
+		layer = self.__context_layers.pop()
+		if not layer:
+			return
+		if self.__shared:
+			self.__unshare()
+
+		if 'units' in layer:
+			self.__units = layer['units']['dispenser']
+		if 'units_custom' in layer:
+			del self.__units_custom[layer['units_custom']['count']:]
+
+		params = set(layer.get('parameters', ())) | set(layer.get('parameters_spec', ()))
+		modified = dict((param, self.__parameters.get(param)) for param in params)
+
+		for name in ('parameters', 'parameters_spec', 'parameters_bounds', 'scalings'):
+			if name not in layer:
+				continue
+			store = self.__context_store(name)
+			if store is None:
+				self.__parameters_bounds = store = {}
+			for key, old in layer[name].items():
+				if old is _CONTEXT_MISSING:
+					store.pop(key, None)
+				else:
+					store[key] = old
+			if name == 'parameters_bounds' and not store:
+				self.__parameters_bounds = None # No bounds are checked when this is None
+
+		if 'units' in layer or 'scalings' in layer:
+			self.__cache_scaled = {}
+			self.__scaling_cache = {}
+			self.__cache_bounds = {}
+		for param in layer.get('parameters_bounds', ()):
+			self.__cache_bounds.pop(param, None)
+
+		# Invalidate caches of parameters modified within the context
+		for param in params:
+			self.__graph_update(param)
+		self.__invalidate(params, structural=[param for param in params if not (isinstance(modified[param], Quantity) and isinstance(self.__parameters.get(param), Quantity))])
 
-		# Restore context
-		self.__parameters_spec = context['parameters_spec']
-		self.__parameters = context['parameters']
-		self.__parameters_bounds = context['parameters_bounds']
-		self.__scalings = context['scalings']
-		self.__units = context['units']
-		self.__units_custom = context['units_custom']
-		self.__default_scaled = context['default_scaled']
+	def __commit(self):
+		'''
+		Pop the top-most journal layer without restoring it, merging its entries
+		into the enclosing layer (if any) so that the enclosing context can
+		still restore them.
+		'''
+		layer = self.__context_layers.pop()
+		if not self.__context_layers:
+			return
+		parent = self.__context_layers[-1]
+		for name, journal in layer.items():
+			parent_journal = parent.setdefault(name, {})
+			for key, old in journal.items():
+				parent_journal.setdefault(key, old)
 
-		# Remove context
-		if len(self.__context_save) == 0:
-			del self.__context_save
+	def __record(self, name, key):
+		'''
+		Prepare for the modification of `key` in the internal store `name`, by
+		taking a private copy of any shared state, and recording the current
+		value in the active context (if any).
+		'''
+		if self.__frozen:
+			raise errors.ParameterFrozenError("Frozen Parameters instances cannot be modified. Use `copy` to obtain a modifiable copy.")
+		if self.__shared:
+			self.__unshare()
+		if name == 'units' and self.__units_shared:
+			self.__units = self.__units.copy()
+			self.__units_shared = False
+		if self.__context_layers:
+			journal = self.__context_layers[-1].setdefault(name, {})
+			if key not in journal:
+				if name == 'units':
+					journal[key] = copy.copy(self.__units)
+				elif name == 'units_custom':
+					journal[key] = len(self.__units_custom)
+				else:
+					store = self.__context_store(name)
+					journal[key] = _CONTEXT_MISSING if store is None else store.get(key, _CONTEXT_MISSING)
+
+	def __context_store(self, name):
+		if name == 'parameters':
+			return self.__parameters
+		if name == 'parameters_spec':
+			return self.__parameters_spec
+		if name == 'parameters_bounds':
+			return self.__parameters_bounds
+		if name == 'scalings':
+			return self.__scalings
+		raise ValueError("Invalid store name: %s" % name)
+
+	def __unshare(self):
+		self.__parameters = self.__parameters.copy()
+		self.__parameters_spec = self.__parameters_spec.copy()
+		if self.__parameters_bounds is not None:
+			self.__parameters_bounds = self.__parameters_bounds.copy()
+		self.__scalings = self.__scalings.copy()
+		self.__units_custom = list(self.__units_custom)
+		self.__graph_deps = self.__graph_deps.copy()
+		self.__graph_sups = dict((param, set(sups)) for param, sups in self.__graph_sups.items())
+		self.__shared = False
+
+	def copy(self):
+		'''
+		copy()
 
-		# Clear cache
-		self.__cache_deps = {}
-		self.__cache_sups = {}
-		self.__cache_scaled = {}
-		self.__scaling_cache = {}
+		:returns: A new :class:`Parameters` instance with the same parameters, unit specifications, bounds and scalings as this instance.
+
+		Copying is cheap, as the internal state of both instances (including
+		the unit dispenser) is shared until either of them is modified; at which
+		point the modified instance takes a private copy. This makes it suitable
+		for creating independent clones for use in other threads or worker processes.
+
+		>>> q = p.copy()
+		>>> q(x=2)
+		>>> p('x') # Unaffected by changes to q.
+
+		.. note:: Units added using :func:`unit_add` and units contexts set using
+			:func:`set_units_context` affect only the instance on which they are
+			called. Function caches are configured identically, but are not
+			populated in the new instance.
+		'''
+		other = type(self).__new__(type(self))
+		other.__dict__.update(self.__dict__)
+		self.__shared = other.__shared = True
+		self.__units_shared = other.__units_shared = True
+		other.__context_layers = []
+		other.__frozen = False
+		other.__stats = None
+		other.__stats_data = Statistics()
+		other.__cache_scaled = {}
+		other.__cache_funcs = dict((param, LRUCache(cache.capacity)) for param, cache in self.__cache_funcs.items())
+		other.__cache_plans = {}
+		other.__cache_plans_index = {}
+		other.__scaling_cache = {}
+		other.__cache_bounds = {}
+		other.__cache_exprs = LRUCache(self.__cache_exprs.capacity)
+		other.__cache_analysis = LRUCache(_CACHE_CAPACITY)
+		return other
+
+	def __copy__(self):
+		return self.copy()
+
+	def freeze(self):
+		'''
+		freeze()
+
+		:returns: A read-only copy of this :class:`Parameters` instance, which can be safely queried from many threads at once.
+
+		The internal caches of :class:`Parameters` instances are populated during
+		queries, and are invalidated when the instance is modified. Frozen
+		instances cannot be modified (any attempt to do so raises a
+		:class:`ParameterFrozenError`), and so their caches are never invalidated:
+		stored values are scaled ahead of time, and the remaining caches are
+		either updated atomically or guarded by locks. This allows many threads
+		(for example, those of a thread pool serving requests) to evaluate
+		parameters, with or without overrides, concurrently.
+
+		>>> f = p.freeze()
+		>>> f('x', y=2) # Safe to call from any thread
+		>>> f.x = 1 # Raises ParameterFrozenError
+
+		Frozen instances are unaffected by subsequent changes to the parameters,
+		unit specifications, bounds, scalings and units (including the units
+		context) of the instance from which they were created; and modifiable
+		copies can be obtained using :func:`copy`.
+		'''
+		if self.__frozen:
+			return self
+		other = self.copy()
+		# Frozen instances have their own unit dispenser, which is never modified
+		other.__units = self.__units.copy()
+		other.__units_shared = False
+		other.__freeze()
+		return other
+
+	def __freeze(self):
+		self.__cache_funcs = dict((param, LockedLRUCache(cache.capacity)) for param, cache in self.__cache_funcs.items())
+		self.__cache_exprs = LockedLRUCache(self.__cache_exprs.capacity)
+		self.__cache_analysis = LockedLRUCache(_CACHE_CAPACITY)
+		for param, value in self.__parameters.items():
+			if isinstance(value, Quantity):
+				self.__cache_scaled[param] = self.__get_quantity(value, param=param, scaled=True)
+		self.__frozen = True
+
+	################## PICKLING ##############################################
+	# Parameters instances are pickled compactly: caches are omitted; quantities
+	# are stored as values, unit strings and whether they are absolute; functions
+	# defined by symbolic expressions are stored as source; and the unit
+	# dispenser is stored as its class, unless its units, contexts, scalings or
+	# conversion maps have been modified (in which case it is pickled in full).
+	# Other functions are pickled by reference, or using `cloudpickle` (if
+	# installed) where this is not possible (as for lambda functions).
+
+	def __getstate__(self):
+		functions = {}
+		values = {}
+		for pam, value in self.__parameters.items():
+			if isinstance(value, types.FunctionType):
+				units = self.__parameters_spec.get(pam)
+				functions[pam] = (self.__function_state(pam, value), None if units is None else unicode(units))
+			elif isinstance(value, Quantity):
+				values[pam] = (value.value, unicode(value.units), value.absolute)
+			else:
+				values[pam] = value
+
+		bounds = {}
+		for pam, bound in (self.__parameters_bounds or {}).items():
+			bounds[pam] = ([((lower.value, unicode(lower.units)), (upper.value, unicode(upper.units))) for lower, upper in bound.bounds], bound.error, bound.clip, bound.inclusive)
+
+		return {
+			'dispenser': self.__dispenser_state(),
+			'units_custom': self.__units_custom,
+			'units_context': self.__units.context,
+			'default_scaled': self.__default_scaled,
+			'scalings': dict((dimension, (scaling.value, unicode(scaling.units))) for dimension, scaling in self.__scalings.items()),
+			'parameters': values,
+			'parameters_functions': functions,
+			'parameters_units': dict((pam, unicode(units)) for pam, units in self.__parameters_spec.items() if pam not in self.__parameters and units is not None),
+			'parameters_bounds': bounds,
+			'parameters_cache': dict((pam, cache.capacity) for pam, cache in self.__cache_funcs.items()),
+			'expressions_cache': self.__cache_exprs.capacity,
+			'frozen': self.__frozen,
+		}
+
+	def __setstate__(self, state):
+		kind, dispenser = state['dispenser']
+		if kind == 'class':
+			self.__init__(dispenser=dispenser(), default_scaled=state['default_scaled'])
+			for unit in state['units_custom']:
+				self.unit_add(unit)
+		else:
+			self.__init__(dispenser=pickle.loads(dispenser) if kind == 'cloudpickle' else dispenser, default_scaled=state['default_scaled'])
+			self.__units_custom = list(state['units_custom']) # Already present in the dispenser
+		if state['units_context'] is not None:
+			self.set_units_context(state['units_context'][0], **state['units_context'][1])
+		self.scaling(**state['scalings'])
+
+		parameters = {}
+		for pam, value in state['parameters'].items():
+			if type(value) is tuple:
+				value = Quantity(value[0], value[1], absolute=value[2], dispenser=self.__units)
+			parameters[pam] = value
+		for pam, (function, units) in state['parameters_functions'].items():
+			parameters[pam] = (self.__function_restore(function), '' if units is None else units)
+		self.__set(parameters)
+		self.__spec(state['parameters_units'])
+		for pam, (bounds, error, clip, inclusive) in state['parameters_bounds'].items():
+			self.set_bounds({pam: bounds}, error=error, clip=clip, inclusive=inclusive)
+
+		self.cache(**state['parameters_cache'])
+		self.__cache_exprs.capacity = state['expressions_cache']
+		if state['frozen']:
+			self.__freeze()
+
+	def __dispenser_state(self):
+		if not self.__units._modified:
+			return ('class', type(self.__units))
+		try:
+			pickle.dumps(self.__units, pickle.HIGHEST_PROTOCOL)
+			return ('dispenser', self.__units)
+		except Exception:
+			pass
+		try:
+			import cloudpickle
+		except ImportError:
+			raise errors.ParametersException("The unit dispenser has been modified using functions which cannot be pickled by reference (such as lambda functions). Install `cloudpickle` to pickle such functions.")
+		return ('cloudpickle', cloudpickle.dumps(self.__units, pickle.HIGHEST_PROTOCOL))
+
+	def __function_state(self, pam, f):
+		if hasattr(f, 'expression'):
+			return ('expression', str(f.expression))
+		try:
+			pickle.dumps(f, pickle.HIGHEST_PROTOCOL)
+			return ('function', f)
+		except Exception:
+			pass
+		try:
+			import cloudpickle
+		except ImportError:
+			raise errors.ParametersException("Parameter '%s' is defined by a function which cannot be pickled by reference (such as a lambda function). Install `cloudpickle` to pickle such functions." % pam)
+		return ('cloudpickle', cloudpickle.dumps(f, pickle.HIGHEST_PROTOCOL))
+
+	def __function_restore(self, state):
+		kind, f = state
+		if kind == 'cloudpickle':
+			return pickle.loads(f)
+		return f
 
 	############# PARAMETER RESOLUTION #########################################
 	def __get_pam_name(self, param):
@@ -517,32 +885,172 @@ class Parameters(object):
 		return "_%s" % param
 
 	def __get_pam_deps(self, param):
-		try:
-			return self.__cache_deps[param]
-		except:
-			if param not in self.__parameters:
-				return []
+		return self.__graph_deps.get(param, [])
 
-			value = self.__parameters[param]
-			if type(value) == types.FunctionType:
-				self.__cache_deps[param] = list(map(self.__get_pam_name, self.__function_getargs(value)))
-			else:
-				self.__cache_deps[param] = []
+	def __get_pam_sups(self, param):
+		return list(self.__graph_sups.get(param, ()))
 
-			return self.__cache_deps[param]
+	############# DEPENDENCY GRAPH #############################################
+	# The forward (__graph_deps) and reverse (__graph_sups) adjacency of the
+	# dependency graph are maintained incrementally as parameters are set and
+	# forgotten. Parameters that are not functions have no dependencies.
+	# Analyses of the graph (see `__graph_varying`) are cached until the graph
+	# changes.
 
-	def __get_pam_sups(self, param):
-		try:
-			return self.__cache_sups[param]
-		except:
-			sups = []
-			for param2 in self.__parameters:
-				if param in self.__get_pam_deps(param2):
-					sups.append(param2)
+	def __graph_update(self, param):
+		'''
+		Update the dependency graph to reflect the current definition of `param`.
+		'''
+		previous = self.__graph_deps.get(param)
+		for dep in self.__graph_deps.pop(param, ()):
+			sups = self.__graph_sups.get(dep)
+			if sups is not None:
+				sups.discard(param)
+				if len(sups) == 0:
+					del self.__graph_sups[dep]
+
+		value = self.__parameters.get(param)
+		if type(value) is types.FunctionType:
+			deps = list(map(self.__get_pam_name, self.__function_getargs(value)))
+			for dep in deps:
+				self.__graph_sups.setdefault(dep, set()).add(param)
+			self.__graph_deps[param] = deps
+		elif param in self.__parameters:
+			self.__graph_deps[param] = []
+
+		if self.__graph_deps.get(param) != previous:
+			self.__cache_analysis.clear()
+
+	def __graph_rebuild(self):
+		self.__graph_deps = {}
+		self.__graph_sups = {}
+		self.__cache_analysis.clear()
+		for param in self.__parameters:
+			self.__graph_update(param)
+
+	def __graph_dependents(self, *params):
+		'''
+		Returns the set of parameters which depend (possibly transitively) upon
+		any of `params`, including `params` themselves.
+		'''
+		dependents = set(params)
+		queue = list(dependents)
+		while queue:
+			for sup in self.__graph_sups.get(queue.pop(), ()):
+				if sup not in dependents:
+					dependents.add(sup)
+					queue.append(sup)
+		return dependents
+
+	def __graph_varying(self, wrt, params={}):
+		'''
+		Returns the set of parameters which depend (possibly transitively) upon
+		any of the parameters in `wrt` (including those in `wrt`), when the
+		parameters in `params` are overridden. Overridden parameters depend only
+		upon the arguments of their overriding functions (if any).
+		'''
+		key = (frozenset(wrt), self.__override_signature(params))
+		varying = self.__cache_analysis.get(key)
+		if varying is not None:
+			return varying
+
+		overrides = {}
+		for pam, val in params.items():
+			if type(val) is tuple and len(val) > 0:
+				val = val[0]
+			if type(val) in str_types:
+				val = self.__get_function(val)
+			if type(val) is types.FunctionType:
+				for dep in self.__function_getargs(val):
+					overrides.setdefault(self.__get_pam_name(dep), set()).add(pam)
+
+		varying = set(key[0])
+		queue = list(varying)
+		while queue:
+			pam = queue.pop()
+			for sup in self.__graph_sups.get(pam, ()):
+				if sup not in params and sup not in varying:
+					varying.add(sup)
+					queue.append(sup)
+			for sup in overrides.get(pam, ()):
+				if sup not in varying:
+					varying.add(sup)
+					queue.append(sup)
+
+		varying = frozenset(varying)
+		self.__cache_analysis.set(key, varying)
+		return varying
+
+	def __graph_cycles(self, params):
+		'''
+		Returns a list of the cycles (as sorted lists of parameter names) in the
+		dependency graph which are reachable from any of `params`. Each cycle is
+		a strongly connected component of more than one parameter, as identified
+		by a single (iterative) pass of Tarjan's algorithm. Self-references, which
+		are used for inversion, are not considered to be cycles.
+		'''
+		index = {}
+		lowlink = {}
+		stack = []
+		on_stack = set()
+		cycles = []
+
+		for root in params:
+			if root in index:
+				continue
+			index[root] = lowlink[root] = len(index)
+			stack.append(root)
+			on_stack.add(root)
+			work = [(root, iter(self.__graph_deps.get(root, ())))]
+			while work:
+				node, deps = work[-1]
+				for dep in deps:
+					if dep not in index:
+						index[dep] = lowlink[dep] = len(index)
+						stack.append(dep)
+						on_stack.add(dep)
+						work.append((dep, iter(self.__graph_deps.get(dep, ()))))
+						break
+					elif dep in on_stack:
+						lowlink[node] = min(lowlink[node], index[dep])
+				else:
+					work.pop()
+					if work:
+						lowlink[work[-1][0]] = min(lowlink[work[-1][0]], lowlink[node])
+					if lowlink[node] == index[node]:
+						component = []
+						while True:
+							pam = stack.pop()
+							on_stack.discard(pam)
+							component.append(pam)
+							if pam == node:
+								break
+						if len(component) > 1:
+							cycles.append(sorted(component))
+
+		return cycles
 
-			if sups or param in self.__parameters:
-				self.__cache_sups[param] = sups
-			return sups
+	def __invalidate(self, params, structural=True):
+		'''
+		Invalidate cached data affected by a change in the definition of the
+		parameters in `params`. If the change is `structural` (i.e. the parameter
+		was added, removed, or is or was a function), evaluation plans involving
+		the parameter or any of its (transitive) dependents are also discarded.
+		`structural` may be a boolean applying to all of `params`, or the subset
+		of `params` for which the change is structural.
+		'''
+		for param in params:
+			self.__cache_scaled.pop(param, None)
+		if structural is True:
+			structural = params
+		elif not structural:
+			return
+		for param in structural:
+			if param in self.__cache_funcs:
+				self.__cache_funcs[param].clear()
+		for pam in self.__graph_dependents(*structural):
+			for key in self.__cache_plans_index.pop(pam, ()):
+				self.__cache_plans.pop(key, None)
 
 	############# PARAMETER RETRIEVAL ##########################################
 
@@ -558,6 +1066,7 @@ class Parameters(object):
 		if len(args) == 1 and not arg_islist:
 			result = self.__get_param(args[0], kwargs, default_scaled)
 			if self.__parameters_bounds is not None:
+				kwargs = kwargs.copy()
 				kwargs[args[0]] = result
 				self.__forward_check_bounds(args, kwargs)
 			return result
@@ -566,8 +1075,8 @@ class Parameters(object):
 			args = args[0]
 
 		results = self.__get_params(args, kwargs, default_scaled)
-		kwargs.update(results)
 		if self.__parameters_bounds is not None:
+			kwargs = kwargs.copy()
 			kwargs.update(results)
 			self.__forward_check_bounds(args, kwargs)
 		return results
@@ -594,6 +1103,14 @@ class Parameters(object):
 							warnings.warn(errors.ParameterBoundsUncheckedWarning("Parameter '%s' might be outside bounds. Insufficient parameters passed to check." % pam))
 
 	def __get_params(self, args, kwargs={}, default_scaled=None):
+		plan = self.__get_plan(args, kwargs, default_scaled)
+		if plan is not None:
+			values = self.__run_plan(plan[0], kwargs)
+			rv = {}
+			for pam, slot in plan[1]:
+				rv[pam] = values[slot]
+			return rv
+
 		rv = {}
 		for arg in args:
 			rv[self.__get_pam_name(arg)] = self.__get_param(arg, kwargs, default_scaled)
@@ -605,6 +1122,11 @@ class Parameters(object):
 		as in `kwargs`. If `arg` is instead a function, a string, or a Quantity, action is taken to
 		evaluate it where possible.
 		'''
+		if isinstance(arg, str_types):
+			plan = self.__get_plan((arg,), kwargs, default_scaled)
+			if plan is not None:
+				return self.__run_plan(plan[0], kwargs)[plan[1][0][1]]
+
 		if arg == '_':
 			raise ValueError()
 		pam_name = self.__get_pam_name(arg)
@@ -630,31 +1152,274 @@ class Parameters(object):
 			else:
 				if scaled:
 					try:
-						return self.__cache_scaled[arg]
-					except:
-						self.__cache_scaled[arg] = self.__get_quantity(self.__parameters[arg], param=arg, scaled=scaled)
-						return self.__cache_scaled[arg]
+						value = self.__cache_scaled[arg]
+						if self.__stats is not None:
+							self.__stats.count(arg, 'scaled_hits')
+						return value
+					except KeyError:
+						value = self.__cache_scaled[arg] = self.__get_quantity(self.__parameters[arg], param=arg, scaled=scaled)
+						if self.__stats is not None:
+							self.__stats.count(arg, 'scaled_misses')
+						return value
 				return self.__get_quantity(self.__parameters[arg], param=arg, scaled=scaled)
 
-	def __process_override(self, kwargs, restrict=None):
+	############# EVALUATION PLANS #############################################
+
+	def __get_plan(self, args, kwargs={}, default_scaled=None):
+		'''
+		Returns the (cached) evaluation plan for the parameters named in `args`,
+		given the set of keys overridden in `kwargs`; or None if any of the
+		parameters cannot be resolved by a plan (in which case the recursive
+		evaluation routines should be used instead).
+		'''
+		if default_scaled is None:
+			default_scaled = self.__default_scaled
+		key = (tuple(args), frozenset(kwargs) if kwargs else None, default_scaled)
+		try:
+			return self.__cache_plans[key]
+		except KeyError:
+			pass
+		except TypeError:  # Unhashable arguments, such as lists.
+			return None
+
+		for arg in key[0]:
+			if not isinstance(arg, str_types):
+				return None
+
+		plan = self.__compile_plan(key[0], kwargs, default_scaled)
+		if plan is None:
+			for arg in key[0]:
+				if not self.__is_valid_param(arg):  # Do not cache plans for symbolic expressions
+					return None
+		self.__cache_plans[key] = plan
+		for arg in key[0]:
+			self.__cache_plans_index.setdefault(self.__get_pam_name(arg), set()).add(key)
+		return plan
+
+	def __compile_plan(self, args, kwargs, default_scaled):
+		'''
+		Compile a flat, topologically ordered list of instructions which evaluates
+		the parameters in `args`, with the keys of `kwargs` overridden, such that
+		every node of the dependency graph is evaluated exactly once. Each instruction
+		is a tuple of (opcode, parameter, scaled, extra), and stores its result in
+		the slot corresponding to its index in the instruction list. Functions
+		present in `args` are evaluated as anonymous parameters, but their results
+		are not converted.
+
+		Returns a tuple of (instructions, outputs), where outputs is a list of
+		(name, slot) tuples; or None if the plan cannot be constructed.
+		'''
+		instructions = []
+		slots = {}
+		visiting = set()
+
+		def node(pam, scaled):
+			key = (pam, scaled)
+			if key in slots:
+				return slots[key]
+
+			if pam in kwargs:
+				instruction = (_PLAN_OVERRIDE, pam, scaled, None)
+			elif pam not in self.__parameters:
+				return None
+			elif type(self.__parameters[pam]) is types.FunctionType:
+				f_slot = function(pam)
+				if f_slot is None:
+					return None
+				instruction = (_PLAN_CONVERT, pam, scaled, f_slot)
+			else:
+				instruction = (_PLAN_STORED, pam, scaled, None)
+
+			slots[key] = len(instructions)
+			instructions.append(instruction)
+			return slots[key]
+
+		def function(pam):
+			key = (pam, None)
+			if key in slots:
+				return slots[key]
+			if pam in visiting:
+				raise errors.ParameterRecursionError("Evaluating '%s' would result in recursion." % pam)
+			visiting.add(pam)
+
+			f = self.__parameters[pam]
+			deps = self.__function_getargs(f)
+			if len(deps) > 0 and self.__get_pam_name(deps[-1]) == pam:  # Drop the inversion argument
+				deps = deps[:-1]
+
+			arg_slots = []
+			for dep in deps:
+				dep_name = self.__get_pam_name(dep)
+				if dep_name == '':
+					return None
+				slot = node(dep_name, self.__default_scaled if dep[:1] != '_' else not self.__default_scaled)
+				if slot is None:
+					return None
+				arg_slots.append(slot)
+
+			visiting.remove(pam)
+			slots[key] = len(instructions)
+			instructions.append((_PLAN_FUNCTION, pam, pam in self.__cache_funcs, (f, arg_slots)))
+			return slots[key]
+
+		outputs = []
+		for arg in args:
+			if type(arg) is types.FunctionType:  # Anonymous functions are evaluated, but not converted
+				arg_slots = []
+				for dep in self.__function_getargs(arg):
+					slot = node(self.__get_pam_name(dep), self.__default_scaled if dep[:1] != '_' else not self.__default_scaled)
+					if slot is None:
+						return None
+					arg_slots.append(slot)
+				outputs.append((arg, len(instructions)))
+				instructions.append((_PLAN_FUNCTION, None, False, (arg, arg_slots)))
+				continue
+			if not isinstance(arg, str_types):
+				return None
+			pam = self.__get_pam_name(arg)
+			if pam == '':
+				return None
+			slot = node(pam, default_scaled if arg[:1] != '_' else not default_scaled)
+			if slot is None:
+				return None
+			outputs.append((pam, slot))
+
+		return instructions, outputs
+
+	def __run_plan(self, instructions, kwargs, count=None):
+		'''
+		Execute the instructions of a plan generated by `__compile_plan`, returning
+		the list of slot values. If `count` is not None, overrides may be arrays
+		of length `count`, and functions are evaluated in array mode (see
+		`__range_vectorised`).
+		'''
+		stats = self.__stats
+		values = []
+		for op, pam, scaled, extra in instructions:
+			if op == _PLAN_STORED:
+				if scaled:
+					try:
+						value = self.__cache_scaled[pam]
+						if stats is not None:
+							stats.count(pam, 'scaled_hits')
+					except KeyError:
+						value = self.__cache_scaled[pam] = self.__get_quantity(self.__parameters[pam], param=pam, scaled=True)
+						if stats is not None:
+							stats.count(pam, 'scaled_misses')
+				else:
+					value = self.__get_quantity(self.__parameters[pam], param=pam, scaled=False)
+			elif op == _PLAN_FUNCTION:
+				args = [values[slot] for slot in extra[1]]
+				if count is not None:
+					if stats is not None:
+						start = default_timer()
+					value = self.__range_eval_vectorised(extra[0], args, count)
+					if stats is not None:
+						stats.timed(pam, 'evaluations', 'time', start)
+				elif scaled:  # Function caching is enabled
+					value = self.__cache_func_eval(pam, extra[0], args)
+				else:
+					value = self.__call_function(pam, extra[0], args)
+			elif op == _PLAN_CONVERT:
+				value = self.__get_quantity(values[extra], param=pam, scaled=scaled)
+			elif op == _PLAN_CONSTANT:
+				value = extra
+			else:
+				value = self.__get_quantity(kwargs[pam], param=pam, scaled=scaled)
+			values.append(value)
+		return values
+
+	def __process_override(self, kwargs):
 		'''
 		Process kwargs and make sure that if one of the provided overrides
 		corresponds to an invertable function, that the affected variables are also included
 		as overrides also. An warning is thrown if these variables are specified also
 		and are inconsistent.
+
+		The steps required to do this depend only upon which parameters are
+		overridden, and upon the arguments of the overriding functions (if any);
+		and so are compiled once into an override plan (see `__compile_override_plan`),
+		which is cached alongside the evaluation plans.
 		'''
 
 		if len(kwargs) == 0:
 			return
 
-		if restrict is None:
-			restrict = list(kwargs.keys())
+		stats = self.__stats
+		if stats is not None:
+			overridden = list(kwargs)
+			start = default_timer()
 
-		if len(restrict) == 0:
-			return
+		key = ('override', self.__override_signature(kwargs))
 
-		def check_overspecified(param, kwargs, vals):
-			return
+		plan = self.__cache_plans.get(key)
+		if plan is None:
+			plan = self.__compile_override_plan(kwargs)
+			self.__cache_plans[key] = plan
+			for pam in plan[3]:
+				self.__cache_plans_index.setdefault(pam, set()).add(key)
+		strings, order, stages, _ = plan
+
+		for pam in strings:
+			kwargs[pam] = self.__get_function(kwargs[pam])
+
+		# First evaluate functions to avoid errors later on
+		if order:
+			others = kwargs.copy()
+			for pam in order:
+				kwargs[pam] = others[pam] = self.__get_param(others.pop(pam), others)
+
+		# Now, ratify these changes through the parameter sets to ensure
+		# that the effects of these overrides is properly implemented
+		# inverting any methods with the provided overrides
+		# and then repeating for any newly returned values.
+		# If a method is not invertible, and it is request,
+		# print a warning to this extent.
+		for invert, warn in stages:
+			new = {}
+			for pam in invert:
+				vals = self.__eval_function(pam, kwargs)
+				for key in vals:
+					if key in kwargs and self.__get_quantity(vals[key],scaled=True) != self.__get_quantity(kwargs[key],scaled=True) or key in new and self.__get_quantity(vals[key],scaled=True) != self.__get_quantity(new[key],scaled=True):
+						raise errors.ParameterOverSpecifiedError("Parameter %s is overspecified, with contradictory values. (%s vs. %s)" % (key,vals[key],kwargs[key] if key in kwargs else new[key]) )
+				new.update(vals)
+			for message in warn:
+				warnings.warn(errors.ParameterInconsistentWarning(message))
+			kwargs.update(new)
+
+		if stats is not None:
+			for pam in overridden:
+				stats.timed(pam, 'overrides', 'override_time', start)
+
+	def __override_signature(self, kwargs):
+		'''
+		Returns a hashable summary of the overrides in `kwargs`; consisting of
+		their names and, for functional values, whether they are given as strings
+		and the names of their arguments. The functions themselves are not
+		included, so that plans are shared by overrides with new (but similar)
+		functions, and do not keep these functions alive.
+		'''
+		signature = []
+		for pam, val in kwargs.items():
+			string = type(val) in str_types
+			if type(val) is tuple and len(val) > 0:
+				val = val[0]
+			if type(val) in str_types:
+				val = self.__get_function(val)
+			if type(val) is types.FunctionType:
+				signature.append((pam, string, self.__function_getargs(val)))
+			else:
+				signature.append((pam, None))
+		return frozenset(signature)
+
+	def __compile_override_plan(self, kwargs):
+		'''
+		Returns a tuple of: a list of the overrides given as strings (which are
+		to be substituted by the functions they represent); the order in which to evaluate functional overrides; a list of
+		(invert, warn) stages, where `invert` is a list of parameters whose
+		functions must be inverted and `warn` a list of warnings to emit; and the
+		set of parameters upon whose definitions the plan depends.
+		'''
 
 		def pam_ordering(dependencies, pam_order=[]):
 			'''
@@ -682,14 +1447,14 @@ class Parameters(object):
 				return pam_ordering(dependencies, pam_order)
 
 		# Order overrides to avoid clash of functions
+		strings = []
 		dependencies = {}
-		for pam in restrict:
+		for pam, val in kwargs.items():
 			if pam[0] == "_":
 				raise ValueError("Parameter type is autodetected when passed as a keyword argument. Do not use '_' to switch between scaled and unitted parameters.")
-			val = kwargs[pam]
 			if type(val) in str_types:
+				strings.append(pam)
 				val = self.__get_function(val)
-				kwargs[pam] = val
 			if type(val) is tuple and type(val[0]) is types.FunctionType:
 				val = val[0]
 			if type(val) is tuple and type(val[0]) in str_types:
@@ -699,37 +1464,34 @@ class Parameters(object):
 				deps = [self.__get_pam_name(dep) for dep in self.__function_getargs(val)]
 				dependencies[pam] = set(deps)
 
-		pam_order = pam_ordering(dependencies)
-
-		# First evaluate functions to avoid errors later on
-		for pam in pam_order:
-			if pam in kwargs:
-				val = kwargs[pam]
-				new = kwargs.copy()
-				del new[pam]
-				kwargs[pam] = self.__get_param(val, new)
-
-		# Now, ratify these changes through the parameter sets to ensure
-		# that the effects of these overrides is properly implemented
-		# inverting any methods with the provided overrides
-		# and then recursing on any newly returned values.
-		# If a method is not invertible, and it is request,
-		# print a warning to this extent.
-		new = {}
-		for pam in restrict:
-			if type(self.__parameters.get(pam)) is types.FunctionType:
-				if pam in self.__get_pam_deps(pam):
-					vals = self.__eval_function(pam, kwargs)
-					for key in vals:
-						if key in kwargs and self.__get_quantity(vals[key],scaled=True) != self.__get_quantity(kwargs[key],scaled=True) or key in new and self.__get_quantity(vals[key],scaled=True) != self.__get_quantity(new[key],scaled=True):
-							raise errors.ParameterOverSpecifiedError("Parameter %s is overspecified, with contradictory values. (%s vs. %s)" % (key,vals[key],kwargs[key] if key in kwargs else new[key]) )
-					new.update(vals)
-				else:
-					warnings.warn(errors.ParameterInconsistentWarning("Parameters are possibly inconsistent! The function representing '%s' was overridden because it was not invertable, and so the underlying variables (%s) have not been updated." % (pam, ','.join(self.__function_getargs(self.__parameters[pam])))))
+		order = [pam for pam in pam_ordering(dependencies) if pam in kwargs]
+
+		# Determine which functions must be inverted, and which parameters are
+		# thereby overridden in turn.
+		stages = []
+		depends = set(kwargs)
+		restrict = list(kwargs.keys())
+		while len(restrict) > 0:
+			if len(stages) > len(self.__parameters):
+				raise errors.ParameterRecursionError("Inverting the functions of overridden parameters would result in recursion.")
+			invert = []
+			warn = []
+			new = {}
+			for pam in restrict:
+				if type(self.__parameters.get(pam)) is types.FunctionType:
+					deps = self.__get_pam_deps(pam)
+					if pam in deps:
+						invert.append(pam)
+						for dep in deps[:-1]:
+							new[dep] = True
+					else:
+						warn.append("Parameters are possibly inconsistent! The function representing '%s' was overridden because it was not invertable, and so the underlying variables (%s) have not been updated." % (pam, ','.join(self.__function_getargs(self.__parameters[pam]))))
+			if invert or warn:
+				stages.append((invert, warn))
+			restrict = list(new.keys())
+			depends.update(restrict)
 
-		if len(new) != 0:
-			kwargs.update(new)
-			self.__process_override(kwargs, restrict=list(new.keys()))
+		return strings, order, stages, depends
 
 	def __eval_function(self, param, kwargs={}):
 		'''
@@ -757,8 +1519,12 @@ class Parameters(object):
 		params = self.__get_params(deps_, kwargs)
 		args = [val for val in [params[self.__get_pam_name(x)] for x in deps_]]
 
+		return self.__eval_function_args(param, f, deps, args, kwargs)
+
+	def __eval_function_args(self, param, f, deps, args, kwargs):
+
 		if param in kwargs: # Invert and return updated parameter values
-			r = f(*args)
+			r = self.__call_function(param, f, args)
 			if type(r) not in (list,tuple):
 				r = (r,)
 
@@ -771,63 +1537,104 @@ class Parameters(object):
 			return inverse
 		else: # Return value of function (from cache if possible)
 			if param in self.__cache_funcs:
-				cached = self.__cache_func_handler(param=param, params=args)
-				if cached is not None:
-					return {param: cached}
-				else:
-					value = f(*args)
-					self.__cache_func_handler(param=param, value=value, params=args)
-					return {param: value}
+				return {param: self.__cache_func_eval(param, f, args)}
 			else:
-				return {param: f(*args)}
+				return {param: self.__call_function(param, f, args)}
 
+	def __call_function(self, param, f, args):
+		'''
+		Returns f(*args), recording the evaluation of the function of `param` in
+		the statistics (if they are being collected).
+		'''
+		if self.__stats is None:
+			return f(*args)
+		start = default_timer()
+		try:
+			return f(*args)
+		finally:
+			self.__stats.timed(param, 'evaluations', 'time', start)
 
-	def __cache_func_handler(self, param, value=None, params=None):
+	def __cache_func_eval(self, param, f, args):
 		'''
-		Retrieve and set function cache.
+		Returns f(*args), retrieving the value from the function cache of `param`
+		if it has been computed before with the same arguments.
 		'''
-		if param in self.__cache_funcs:
-			if value is None:
-				if self.__cache_funcs[param] is None:
-					return None
-				value, conditions = self.__cache_funcs[param]
-				if conditions == params:
-					return value
-				else:
-					return None
-			else:
-				self.__cache_funcs[param] = (value, params)
+		cache = self.__cache_funcs[param]
+		try:
+			key = tuple([_cache_key(arg) for arg in args])
+		except TypeError:  # Arguments are not hashable; so skip caching
+			return self.__call_function(param, f, args)
+
+		value = cache.get(key, _CACHE_MISSING)
+		if value is _CACHE_MISSING:
+			value = self.__call_function(param, f, args)
+			cache.set(freeze_key(key), value)
+			if self.__stats is not None:
+				self.__stats.count(param, 'cache_misses')
+		elif self.__stats is not None:
+			self.__stats.count(param, 'cache_hits')
+		return value
 
-	def cache(self, **kwargs):
+	def cache(self, *params, **kwargs):
 		'''
-		cache(**kwargs)
+		cache(*params, **kwargs)
 
-		:param kwargs: Dictionary of boolean values
+		:param params: Sequence of parameter names for which to query cache statistics.
+		:type params: tuple
+		:param kwargs: Dictionary of boolean values or integer cache capacities.
 		:type kwargs: :class:`dict`
 
+		:returns: Dictionary of cache statistics, or, if only one parameter is specified, the statistics for that parameter. If caching is not enabled for a parameter, :python:`None` is returned.
+
 		A utility function to toggle caching of particular parameters. When
 		cache is enabled, if a parameter function has been called before with the
-		same parameter values, then it returns the old value. Note that only
-		one set of parameters is remembered, and so this caching is designed
-		only for situations where the parameter is not expected to change at
-		every call.
+		same parameter values, then it returns the old value. Each cached parameter
+		remembers the values associated with up to `capacity` (128 by default)
+		different sets of arguments, discarding the least recently used values
+		as necessary.
 
 		Example:
 
-		>>> p.cache(x=True, y=False)
+		>>> p.cache(x=True, y=False, z=1024)
+
+		This will enable caching for *x* with the default capacity, disable it
+		for *y*, and enable it for *z* with space for 1024 values.
 
-		This will enable caching for *x* and disable it for *y*.
+		The statistics for a cached parameter can be queried using:
+
+		>>> p.cache('x')
+		{'hits': 10, 'misses': 2, 'evictions': 0, 'size': 2, 'capacity': 128}
 		'''
+		if kwargs and self.__frozen:
+			raise errors.ParameterFrozenError("Frozen Parameters instances cannot be modified. Use `copy` to obtain a modifiable copy.")
 		for kwarg, cache_on in kwargs.items():
-			if kwarg in self.__cache_funcs and not cache_on:
-				self.__cache_funcs.pop(kwarg)
-			if kwarg not in self.__cache_funcs and cache_on:
-				self.__cache_funcs[kwarg] = None
+			self.__invalidate((kwarg,))
+			if cache_on is True:
+				cache_on = _CACHE_CAPACITY
+			if not cache_on:
+				self.__cache_funcs.pop(kwarg, None)
+			elif kwarg in self.__cache_funcs:
+				self.__cache_funcs[kwarg].capacity = cache_on
+			else:
+				self.__cache_funcs[kwarg] = LRUCache(cache_on)
 
-	def __get_quantity(self, value, param=None, unit=None, scaled=False):
+		if len(params) > 0:
+			use_dict = type(params[0]) == list
+			if use_dict:
+				params = params[0]
+
+			stats = {}
+			for param in params:
+				stats[param] = self.__cache_funcs[param].stats() if param in self.__cache_funcs else None
+			if not use_dict and len(stats) == 1:
+				return stats[params[0]]
+			return stats
+
+	def __get_quantity(self, value, param=None, unit=None, scaled=False, bounds=True):
 		'''
 		Return a Quantity or scaled float associated with the value provided
-		and the dimensions of param.
+		and the dimensions of param; checking it against the bounds of param
+		unless `bounds` is False.
 		'''
 
 		q = None
@@ -879,8 +1686,13 @@ class Parameters(object):
 		if q is None:
 			raise errors.QuantityValueError("Unknown value type '%s' with value: '%s'" % (t, value))
 
-		if self.__parameters_bounds is not None and param is not None and param in self.__parameters_bounds:
-			q = self.__check_bounds(self.__parameters_bounds[param], q)
+		if bounds and self.__parameters_bounds is not None and param is not None and param in self.__parameters_bounds:
+			if self.__stats is not None:
+				start = default_timer()
+				q = self.__check_bounds(self.__parameters_bounds[param], q)
+				self.__stats.timed(param, 'bounds_checks', 'bounds_time', start)
+			else:
+				q = self.__check_bounds(self.__parameters_bounds[param], q)
 
 		return q
 
@@ -907,10 +1719,9 @@ class Parameters(object):
 			try:
 				if isinstance(arg, str_types):
 					# We have a string which cannot be a single parameter. Check to see if it is trying to be.
-					arg = sympy.S(arg, sympy.abc._clash)
-					fs = list(arg.free_symbols)
-					if len(fs) == 1 and str(arg) == str(fs[0]):
-						raise errors.ParameterInvalidError("There is no parameter, and no interpretation, of '%s' which is recognised by Parameters." % arg)
+					expr, fs, f = self.__get_expression(arg)
+					if expr.is_Symbol:
+						raise errors.ParameterInvalidError("There is no parameter, and no interpretation, of '%s' which is recognised by Parameters." % expr)
 				return self.__eval(self.optimise(arg), kwargs=kwargs, default_scaled=default_scaled)
 			except errors.ParameterInvalidError as e:
 				raise e
@@ -936,28 +1747,60 @@ class Parameters(object):
 			raise errors.ParameterInvalidError("Attempt to set invalid parameters: %s . Parameters must be valid python identifiers matching ^[%sA-Za-z][_a-zA-Z0-9]*$." % (','.join(bad), '_' if allow_leading_underscore else ''))
 
 	def __set(self, kwargs):
-
-		self.__cache_deps = {}
-		self.__cache_sups = {}
-
+		'''
+		Set the parameters in `kwargs` (a dictionary of values, functions and/or
+		expressions). Names and function signatures are validated in a single
+		pass before anything is modified; the dependency graph is then updated for
+		all parameters at once, and checked for cycles in a single traversal. If
+		any cycles (or other errors) are found, all of them are reported and none
+		of the parameters are changed.
+		'''
 		self.__check_valid_params(kwargs, allow_leading_underscore=False)
 
+		values = {}
+		function_units = {}
 		for param, val in kwargs.items():
-			if param in self.__cache_funcs:
-				self.__cache_funcs[param] = None
-			if param in self.__cache_scaled:  # Clear cache if present.
-				del self.__cache_scaled[param]
 			if isinstance(val, (types.FunctionType,) + str_types):
-				self.__parameters[param] = self.__check_function(param, self.__get_function(val))
-				self.__spec({param: self.__get_unit('')})
+				values[param] = self.__check_function(param, self.__get_function(val))
+				function_units[param] = ''
 			elif isinstance(val, (list, tuple)) and isinstance(val[0], (types.FunctionType,) + str_types):
-				self.__parameters[param] = self.__check_function(param, self.__get_function(val[0]))
-				self.__spec({param: self.__get_unit(val[1])})
+				values[param] = self.__check_function(param, self.__get_function(val[0]))
+				function_units[param] = val[1]
 			else:
-				self.__parameters[param] = self.__get_quantity(val, param=param)
-				if isinstance(self.__parameters[param], Quantity):
-					self.__spec({param: self.__parameters[param].units})
-			if param in dir(type(self)):
+				values[param] = val
+
+		previous = dict((param, self.__parameters.get(param)) for param in values)
+
+		self.__enter__()
+		committed = False
+		try:
+			for param, val in values.items():
+				self.__record('parameters', param)
+				if param in function_units:
+					self.__parameters[param] = val
+					self.__spec({param: self.__get_unit(function_units[param])})
+				else:
+					self.__parameters[param] = self.__get_quantity(val, param=param)
+					if isinstance(self.__parameters[param], Quantity):
+						self.__spec({param: self.__parameters[param].units})
+				self.__graph_update(param)
+
+			cycles = self.__graph_cycles(function_units)
+			if cycles:
+				raise errors.ParameterRecursionError("Adding functions would result in recursion between parameters: %s." % '; '.join('{%s}' % ', '.join(cycle) for cycle in cycles))
+			self.__commit()
+			committed = True
+		finally:
+			if not committed:  # Restore the previous state, preserving the original traceback
+				self.__exit__(None, None, None)
+
+		self.__invalidate(values.keys(), structural=[param for param in values if not (isinstance(previous[param], Quantity) and isinstance(self.__parameters[param], Quantity))])
+
+		reserved = _RESERVED_NAMES.get(type(self))
+		if reserved is None:
+			reserved = _RESERVED_NAMES[type(self)] = frozenset(dir(type(self)))
+		for param in values:
+			if param in reserved:
 				warnings.warn(errors.ParameterNameWarning("Parameter '%s' will not be accessible using the attribute notation `p.%s`, as it conflicts with a method name of Parameters." % (param, param)))
 
 	def __update(self, kwargs):
@@ -966,30 +1809,41 @@ class Parameters(object):
 
 		self.__process_override(kwargs)
 
+		updates = {}
 		for param, value in kwargs.items():
 			if param not in self.__parameters or not (isinstance(self.__parameters.get(param), types.FunctionType) and param in self.__get_pam_deps(param)):
-				self.__set({param: kwargs[param]})
+				updates[param] = value
+		if updates:
+			self.__set(updates)
 
 	def __and__(self, other):
 		if not isinstance(other, dict):
 			raise errors.ParametersException("The binary and operator is used to set the unit specification for parameters; and requires a dictionary of units.")
 		for param, units in other.items():
 			if isinstance(self.__parameters.get(param), Quantity):
+				self.__record('parameters', self.__get_pam_name(param))
 				self.__parameters[self.__get_pam_name(param)] = self.__get_param(self.__get_pam_united_name(param))(units)
 		self.__spec(other)
 
 	def __spec(self, kwargs):
 		''' Set units for parameters. '''
 		for arg in kwargs:
+			self.__record('parameters_spec', arg)
 			self.__parameters_spec[arg] = self.__get_unit(kwargs[arg])
-			if self.__parameters.get(arg) is not None:
-				self.__parameters[arg].units = self.__parameters_spec[arg]
+			value = self.__parameters.get(arg)
+			if isinstance(value, Quantity) and value.units is not self.__parameters_spec[arg]:
+				self.__record('parameters', arg)
+				self.__parameters[arg] = value._new(value.value, self.__parameters_spec[arg], absolute=value.absolute)
 
 	def __remove(self, param):
+		self.__record('parameters', param)
+		self.__record('parameters_spec', param)
+		self.__invalidate((param,))
 		if param in self.__parameters:
 			del self.__parameters[param]
 		if param in self.__parameters_spec:
 			del self.__parameters_spec[param]
+		self.__graph_update(param)
 
 	def forget(self, *params):
 		'''
@@ -1014,51 +1868,87 @@ class Parameters(object):
 		return self
 
 	def __sympy_to_function(self, expr):
+		return self.__get_expression(expr)[2]
+
+	def __get_expression(self, expr):
+		'''
+		Returns a tuple of the sympy expression corresponding to `expr` (which
+		may be a string or sympy object), a list of its free symbols, and a function
+		of those symbols which evaluates it. Results are cached by expression.
+		'''
 		try:
-			expr = sympy.S(expr, locals=sympy.abc._clash)
-			syms = list(expr.free_symbols)
-			f = sympy.utilities.lambdify(syms, expr, dummify=False, modules=['numpy','mpmath','math','sympy'])
-			return f
+			entry = self.__cache_exprs.get(expr)
+		except TypeError:  # Unhashable sympy objects
+			entry = None
+		if entry is not None:
+			return entry
+
+		sympy = _sympy()
+		try:
+			sexpr = sympy.S(expr, locals=sympy.abc._clash)
+			syms = list(sexpr.free_symbols)
+			f = sympy.utilities.lambdify(syms, sexpr, dummify=False, modules=_LAMBDIFY_MODULES)
 		except Exception, e:
 			print(e)
 			raise errors.SymbolicEvaluationError('String \'%s\' is not a valid symbolic expression.' % (expr))
+		f.expression = sexpr  # Retained so that the expression can be inlined by `compile`
+
+		entry = (sexpr, syms, f)
+		try:
+			self.__cache_exprs.set(expr, entry)
+		except TypeError:
+			pass
+		return entry
+
+	def cache_expressions(self, capacity=None, clear=False):
+		'''
+		cache_expressions(capacity=None, clear=False)
+
+		:param capacity: The maximum number of symbolic expressions to cache (if not :python:`None`).
+		:type capacity: int
+		:param clear: :python:`True` if the cache should be emptied. :python:`False` otherwise.
+		:type clear: bool
+
+		:returns: A dictionary of statistics for the expression cache.
+
+		Symbolic expressions (such as those in :python:`p('x^2 + y^2')`, or passed as
+		parameter overrides) are parsed and converted into python functions only
+		once, and stored in a cache of the `capacity` (128 by default) most
+		recently used expressions. This method allows you to resize or clear
+		this cache, and to query its statistics. For example:
+
+		>>> p.cache_expressions(capacity=1024)
+		{'hits': 10, 'misses': 2, 'evictions': 0, 'size': 2, 'capacity': 1024}
+		'''
+		if capacity is not None:
+			self.__cache_exprs.capacity = capacity
+		if clear:
+			self.__cache_exprs.clear()
+		return self.__cache_exprs.stats()
 
 	def __get_function(self, expr):
 		if isinstance(expr, types.FunctionType):
 			return expr
 		return self.__sympy_to_function(expr)
 
-	def __check_function(self, param, f, forbidden=None):
-
+	def __check_function(self, param, f):
+		'''
+		Check that the signature of `f` is suitable for the definition of
+		`param`. Recursion is checked for separately (see `__set`).
+		'''
 		_param = '_' + param
 
-		inspection = inspect.getargspec(f)
-		if inspection.varargs is not None or inspection.keywords is not None:
+		code = f.__code__
+		if code.co_flags & (_CO_VARARGS | _CO_VARKEYWORDS):
 			raise ValueError("Cannot add parameter function that uses varargs or keyword arguments for '%s'." % param)
-		if (param in inspection.args and inspection.args.index(param) != len(inspection.args) - 1) or (_param in inspection.args and inspection.args.index(_param) != len(inspection.args) - 1):
+		args = code.co_varnames[:code.co_argcount]
+		if (param in args and args.index(param) != len(args) - 1) or (_param in args and args.index(_param) != len(args) - 1):
 			raise ValueError("Self-reference for inversion must be the last parameter provided in args for '%s'." % param)
-		if (param in inspection.args or _param in inspection.args)and inspection.defaults != (None,):
+		if (param in args or _param in args) and f.__defaults__ != (None,):
 			raise ValueError("Cannot add parameter function that does not set a default value of None for self-referential parameter in definition for '%s'." % param)
-		if param not in inspection.args and _param not in inspection.args and inspection.defaults != None:
+		if param not in args and _param not in args and f.__defaults__ is not None:
 			raise ValueError("Cannot add parameter function that provides default values for parameters in '%s'." % param)
 
-		args = list(self.__function_getargs(f))
-
-		if param in args:
-			args.remove(param)
-
-		if forbidden is None:
-			forbidden = []
-		else:
-			for arg in forbidden:
-				if arg in args:
-					raise errors.ParameterRecursionError("Adding function would result in recursion with function '%s'" % arg)
-		forbidden.append(param)
-
-		for arg in args:
-			if isinstance(self.__parameters.get(arg, None), types.FunctionType):
-				self.__check_function(arg, self.__parameters.get(arg), forbidden=forbidden[:])
-
 		return f
 
 	def __function_getargs(self, f):  # faster than inspect.getargspec(f).args
@@ -1082,12 +1972,16 @@ class Parameters(object):
 		'''
 
 		if unit in self.__scaling_cache:
+			if self.__stats is not None:
+				self.__stats.scaling_hits += 1
 			return self.__scaling_cache[unit]
 
 		scale = self.__basis_scale(unit)
 		scaling = scale.value * scale.units.scale(unit)
 
 		self.__scaling_cache[unit] = scaling
+		if self.__stats is not None:
+			self.__stats.scaling_misses += 1
 		return scaling
 
 	################ EXPOSE PARAMETERS #########################################
@@ -1140,10 +2034,13 @@ class Parameters(object):
 		for param in params:
 			yield param
 
+	def __contains__(self, param):
+		return param in self.__parameters
+
 	def __getitem__(self, key):
 		if type(key) == int:
 			return sorted(self.__parameters.keys())[key]
-		return self.__get(key)
+		return self.__get((key,), {})
 
 	def __setitem__(self, key, value):
 		self.__update({key: value})
@@ -1245,7 +2142,7 @@ class Parameters(object):
 
 		Note that multiple parameters can be queried and set at the same time.
 
-		.. warning:: Using parameter bounds greatly increases the amount of computation done during parameter retrieval. It is recommended that you do not use parameter bounds in contexts which require minimal runtime, such as numerical integration.
+		.. note:: Bounds are compiled into intervals of scaled values, and so checking them (including for numpy arrays) is cheap. Nevertheless, parameter retrieval with bounds does require additional computation; including, when overriding a parameter, the evaluation of any bounded parameters which depend upon it. To check many values at once, use :func:`validate`.
 		'''
 		self.set_bounds(bounds)
 
@@ -1292,7 +2189,7 @@ class Parameters(object):
 		Will warp 'x' to the closer of 0 or 100 if outside of the range [0,100],
 		reporting a warning in the process.
 
-		.. warning:: Using parameter bounds greatly increases the amount of computation done during parameter retrieval. It is recommended that you do not use parameter bounds in contexts which require minimal runtime, such as numerical integration.
+		.. note:: Bounds are compiled into intervals of scaled values, and so checking them (including for numpy arrays) is cheap. Nevertheless, parameter retrieval with bounds does require additional computation; including, when overriding a parameter, the evaluation of any bounded parameters which depend upon it. To check many values at once, use :func:`validate`.
 		'''
 		if not isinstance(bounds_dict, dict):
 			raise ValueError("Bounds must be specified as a dictionary. Provided with: '%s'." % (bounds_dict))
@@ -1315,39 +2212,136 @@ class Parameters(object):
 				upper = self.__get_quantity(upper, param=key)
 				bounds_new.append((lower, upper))
 
+			self.__record('parameters_bounds', key)
 			if self.__parameters_bounds is None:
 				self.__parameters_bounds = {}
 			self.__parameters_bounds[key] = Bounds(key, self.units(key), bounds_new, error=error, clip=clip, inclusive=inclusive)
+			self.__cache_bounds.pop(key, None)
 
-	def __check_bounds(self, bounds, value):
+	def validate(self, **values):
+		'''
+		validate(**values)
+
+		:param values: A dictionary of parameter values (which may be numpy arrays) to check against the parameter bounds.
+		:type values: dict
+
+		:returns: A boolean numpy array which is :python:`True` wherever all of the provided values are within the bounds of their respective parameters.
+
+		This method allows you to check an entire sweep of parameter values
+		against the parameter bounds at once, without raising errors or
+		generating warnings. Values are interpreted just as they would be if
+		passed as overrides (quantities being first converted to the units of
+		their parameter, raising a :python:`UnitConversionError` if this is not
+		possible), and are broadcast against one another. Only the bounds
+		of the parameters passed are checked; and parameters without bounds are
+		always considered valid.
+
+		>>> p.bounds(x=(0,1))
+		>>> p.validate(x=np.linspace(-1,1,5))
+		array([False, False,  True,  True,  True], dtype=bool)
+		>>> np.flatnonzero(~p.validate(x=np.linspace(-1,1,5))) # Indices of invalid values
+		array([0, 1])
+		'''
+		mask = True
+		for param, value in values.items():
+			value = self.__bounds_value(param, value)
+			if self.__parameters_bounds is not None and param in self.__parameters_bounds:
+				mask = mask & self.__bounds_mask(self.__get_bounds_compiled(param), value)
+			else:
+				mask = mask & np.ones(np.shape(value), dtype=bool)
+		return np.asarray(mask)
+
+	def __bounds_value(self, param, value):
+		'''
+		Returns `value` in scaled units, converting quantities to the units of
+		`param` first (which raises a UnitConversionError if they are not
+		compatible).
+		'''
+		if type(value) is tuple:
+			value = self.__get_quantity(value)
 		if isinstance(value, Quantity):
-			scaled = False
-			value_comp = value
-		else:
-			scaled = True
-			value_comp = Quantity(value, self.__parameters_spec.get(bounds.param, None), dispenser=self.__units)
+			units = self.__parameters_spec.get(param)
+			if units is not None and value.units is not units:
+				value = value(units)
+			return value.value / self.__unit_scaling(value.units)
+		return value
 
+	def __get_bounds_compiled(self, param):
+		'''
+		Returns a tuple of the (sorted, and with overlapping intervals merged)
+		lower and upper edges of the bounds on `param` in scaled units, widened
+		(or narrowed, if the bounds are not inclusive) by a small relative
+		tolerance; the unadjusted edges; whether the bounds are inclusive; and
+		a list of the adjusted intervals (for the fast checking of scalars).
+		'''
+		try:
+			return self.__cache_bounds[param]
+		except KeyError:
+			pass
+
+		bounds = self.__parameters_bounds[param]
+		intervals = []
+		for lower, upper in bounds.bounds:
+			lower = self.__get_quantity(lower, scaled=True)
+			upper = self.__get_quantity(upper, scaled=True)
+			if lower <= upper:
+				intervals.append([lower, upper])
+		intervals.sort()
+
+		merged = []
+		for interval in intervals:
+			if merged and interval[0] < merged[-1][1]:
+				merged[-1][1] = max(merged[-1][1], interval[1])
+			else:
+				merged.append(interval)
+
+		edges = np.array(merged, dtype=float).reshape(-1, 2)
+		tolerance = np.where(np.isinf(edges), 0, np.abs(edges) * 1e-10)
 		if bounds.inclusive:
-			for bound in bounds.bounds:
-				if bound[0] <= value_comp and bound[1] >= value_comp:
-					return value
+			edges_tol = edges + tolerance * [-1, 1]
 		else:
-			for bound in bounds.bounds:
-				if bound[0] < value_comp and bound[1] > value_comp:
+			edges_tol = edges + tolerance * [1, -1]
+
+		compiled = self.__cache_bounds[param] = (edges_tol[:, 0], edges_tol[:, 1], edges.ravel(), bounds.inclusive, [tuple(interval) for interval in edges_tol.tolist()])
+		return compiled
+
+	def __bounds_mask(self, compiled, value):
+		lower, upper, edges, inclusive, intervals = compiled
+		value = np.asarray(value)
+		if len(lower) == 0:
+			return np.zeros(value.shape, dtype=bool)
+		if inclusive:
+			index = np.searchsorted(lower, value, side='right') - 1
+			return (index >= 0) & (value <= upper[np.maximum(index, 0)])
+		index = np.searchsorted(lower, value, side='left') - 1
+		return (index >= 0) & (value < upper[np.maximum(index, 0)])
+
+	def __check_bounds(self, bounds, value):
+		compiled = self.__get_bounds_compiled(bounds.param)
+		value_comp = self.__bounds_value(bounds.param, value)
+
+		if isinstance(value_comp, np.ndarray):
+			inside = self.__bounds_mask(compiled, value_comp)
+			if inside.all():
+				return value
+		else:
+			inclusive = compiled[3]
+			for lower, upper in compiled[4]:
+				if lower <= value_comp <= upper if inclusive else lower < value_comp < upper:
 					return value
+			inside = False
 
 		if bounds.clip:
 			if bounds.error:
 				warnings.warn(errors.ParameterOutsideBoundsWarning("Value %s for '%s' outside of bounds %s. Clipping to nearest allowable value." % (value, bounds.param, bounds.bounds)))
-			blist = []
-			for bound in bounds.bounds:
-				blist.extend(bound)
-			dlist = map(lambda x: abs(x - value_comp), blist)
-			v = np.array(blist)[np.where(dlist == np.min(dlist))]
-			if scaled:
-				return v
-			else:
-				return v.value / self.__unit_scaling(v.unit)
+			edges = compiled[2]
+			nearest = edges[np.argmin(np.abs(np.asarray(value_comp)[..., np.newaxis] - edges), axis=-1)]
+			clipped = np.where(inside, value_comp, nearest)
+			if not isinstance(value_comp, np.ndarray):
+				clipped = clipped.item()
+			if isinstance(value, Quantity):
+				return value._new(clipped * self.__unit_scaling(value.units), value.units, absolute=value.absolute)
+			return clipped
 		elif bounds.error:
 			raise errors.ParameterOutsideBoundsError("Value %s for '%s' outside of bounds %s" % (value, bounds.param, bounds.bounds))
 
@@ -1407,7 +2401,41 @@ class Parameters(object):
 		>>> p.range('x', x=(0,10,2), z=[3,4]) # This is also OKAY
 
 		>>> p.range( 'x', x=(0,10,2), z=[1,2,3] ) # This is NOT okay.
+
+		For large ranges, see also :func:`range_vectorised`.
+		'''
+		return self.__range(args, ranges)
+
+	def range_vectorised(self, *args, **ranges):
+		'''
+		range_vectorised(*args, **ranges)
+
+		:param args: A sequence of parameters (or parameter expressions).
+		:type args: tuple
+		:param ranges: A dictionary of overrides and range specifications.
+		:type ranges: dict
+
+		:returns: A numpy array of parameter values if there is a single parameter requested and it is not enclosed in a list, and dictionary of arrays otherwise.
+
+		This method accepts exactly the same arguments as :func:`range`, but
+		rather than resolving the parameters once for every value in the range,
+		it passes entire numpy arrays for the ranged overrides through the
+		dependency graph in a single evaluation. Most parameter functions (and
+		all symbolic expressions) are already compatible with numpy arrays; those
+		that reject arrays (or return a result of the wrong shape) are
+		evaluated element-wise instead. If the ranges cannot be represented as
+		numeric arrays, this method falls back to :func:`range`.
+
+		Scaled parameters are returned as numpy arrays, and united parameters as
+		:class:`Quantity` objects with array values. For example:
+
+		>>> p << {'y': lambda x: x**2}
+		>>> p.range_vectorised( '_y', x = (0,10,1000000) )
+		array([  0.00000000e+00,   1.00000200e-10, ...,   1.00000000e+02])
 		'''
+		return self.__range(args, ranges, vectorised=True)
+
+	def __range(self, args, ranges, vectorised=False):
 
 		if len(args) == 0:
 			raise ValueError('Please specify output variables from ranges.')
@@ -1436,10 +2464,10 @@ class Parameters(object):
 		if count is None:
 			return self.__get(args, ranges)
 
-		if type(args[0]) == list:
-			pargs = args[0]
-		else:
-			pargs = args
+		if vectorised:
+			values = self.__range_vectorised(args, static, lists, count)
+			if values is not None:
+				return values
 
 		for i in range(count):
 			d = {}
@@ -1463,6 +2491,122 @@ class Parameters(object):
 
 		return values
 
+	def __range_vectorised(self, args, static, lists, count):
+		'''
+		Evaluate the parameters in `args` over all `count` values of the ranges
+		in `lists` simultaneously, or return None if this is not possible.
+		'''
+		kwargs = static.copy()
+		for param, pam_range in lists.items():
+			pam_range = np.asarray(pam_range)
+			if pam_range.dtype.kind not in 'biufc':  # Ranges of tuples, strings, etc.
+				return None
+			kwargs[param] = pam_range
+
+		use_dict = type(args[0]) == list
+		if use_dict:
+			args = args[0]
+
+		pargs = []
+		for arg in args:
+			if isinstance(arg, str_types) and self.__get_pam_name(arg) not in kwargs and self.__get_pam_name(arg) not in self.__parameters:
+				arg = self.optimise(arg)
+			pargs.append(arg)
+
+		# Functions which do not support arrays are evaluated element-wise (see
+		# `__range_eval_vectorised`); but overrides and bounds checks may still
+		# fail for array values, in which case the caller falls back to element-wise
+		# evaluation. Other errors (such as values outside of bounds) are raised.
+		try:
+			self.__process_override(kwargs)
+			plan = self.__compile_plan(pargs, kwargs, self.__default_scaled)
+			if plan is None:
+				return None
+			results = self.__run_plan(plan[0], kwargs, count=count)
+			if self.__parameters_bounds is not None:
+				self.__forward_check_bounds(args, kwargs)
+		except (ValueError, TypeError):
+			return None
+
+		values = {}
+		for arg, (pam, slot) in zip(args, plan[1]):
+			values[self.__get_pam_name(arg)] = self.__range_broadcast(results[slot], count)
+
+		if len(values) == 1 and not use_dict:
+			return list(values.values())[0]
+		return values
+
+	def __range_eval_vectorised(self, f, args, count):
+		'''
+		Evaluate `f` upon arguments which may be arrays (or Quantity objects with
+		array values) of length `count`, falling back to element-wise evaluation
+		if `f` does not support arrays. The result of evaluating `f` upon arrays
+		is only used if it agrees in shape and value with that of evaluating `f`
+		upon the first element of the arrays.
+		'''
+		if not any(self.__range_varies(arg, count) for arg in args):
+			return f(*args)
+
+		first = f(*[self.__range_index(arg, 0, count) for arg in args])
+		try:
+			value = f(*args)
+			if self.__range_agrees(value, first, count):
+				return value
+		except (ValueError, TypeError):  # Functions which do not support arrays
+			pass
+
+		results = [first]
+		for i in range(1, count):
+			results.append(f(*[self.__range_index(arg, i, count) for arg in args]))
+
+		if isinstance(first, Quantity):
+			units = first.units
+			return first._new(np.array([(r if r.units == units else r(units)).value for r in results]), units, absolute=first.absolute)
+		return np.array(results)
+
+	def __range_varies(self, value, count):
+		# Whether `__range_index` indexes into `value`
+		if isinstance(value, Quantity):
+			return np.shape(value.value)[:1] == (count,)
+		return isinstance(value, np.ndarray) and value.shape[:1] == (count,)
+
+	def __range_agrees(self, value, first, count):
+		'''
+		Returns whether `value` (the result of an evaluation upon arrays of length
+		`count`) is consistent with `first` (the result of evaluating upon the
+		first elements of these arrays).
+		'''
+		if isinstance(first, Quantity) != isinstance(value, Quantity):
+			return False
+		if isinstance(first, Quantity):
+			if value.units != first.units:
+				return False
+			value, first = value.value, first.value
+		value, first = np.asarray(value), np.asarray(first)
+		if value.shape != (count,) + first.shape:
+			return False
+		try:
+			return np.allclose(value[0], first, equal_nan=True)
+		except TypeError:  # Non-numeric values
+			return np.array_equal(value[0], first)
+
+	def __range_index(self, value, i, count):
+		if isinstance(value, Quantity):
+			if np.shape(value.value)[:1] == (count,):
+				return value._new(value.value[i], value.units, absolute=value.absolute)
+		elif isinstance(value, np.ndarray) and value.shape[:1] == (count,):
+			return value[i]
+		return value
+
+	def __range_broadcast(self, value, count):
+		if isinstance(value, Quantity):
+			if np.shape(value.value)[:1] != (count,):
+				return value._new(np.repeat(np.asarray(value.value)[np.newaxis], count, axis=0), value.units, absolute=value.absolute)
+			return value
+		if np.shape(value)[:1] != (count,):
+			return np.repeat(np.asarray(value)[np.newaxis], count, axis=0)
+		return np.asarray(value)
+
 	def __range_sampler(self, sampler):
 		if isinstance(sampler, str_types):
 			if sampler == 'linear':
@@ -1702,11 +2846,12 @@ class Parameters(object):
 		elif isinstance(param, str_types) or type(param).__module__.startswith('sympy'):
 			if len(wrt) > 0:
 				subs = {}
-				expr = sympy.S(param, locals=sympy.abc._clash)
-				for symbol in expr.free_symbols:
+				expr, symbols, f = self.__get_expression(param)
+				varying = self.__graph_varying([self.__get_pam_name(pam) for pam in wrt], params)
+				for symbol in symbols:
 					symbol = str(symbol)
-					if symbol in self and self.is_constant(symbol, *wrt, **params):
-						subs[symbol] = self.__get(str(symbol), params)
+					if symbol in self and self.__get_pam_name(symbol) not in varying:
+						subs[symbol] = self.__get((symbol,), params)
 				expr = expr.subs(subs)
 			else:
 				expr = param
@@ -1714,6 +2859,209 @@ class Parameters(object):
 
 		raise errors.ExpressionOptimisationError("No way to optimise parameter expression: %s ." % param)
 
+	def specialise(self, param, *wrt, **params):
+		'''
+		specialise(param, *wrt, **params)
+
+		:param param: Any parameter specification that is accepted by parameter retrieval.
+		:type param: object
+		:param wrt: Parameters which should be allowed to vary.
+		:type wrt: tuple
+		:param params: Parameter overrides to use for all other parameters.
+		:type params: dict
+
+		:returns: A function which accepts values for each of the parameters in `wrt` (in order), and returns the value of `param`.
+
+		Whereas :func:`optimise` can only pre-evaluate parameters in symbolic
+		expressions, this method works for parameters defined by arbitrary python
+		functions. Every parameter upon which `param` depends which does not
+		itself depend upon a parameter in `wrt` is evaluated once (subject
+		to the overrides in `params`), and the returned function evaluates only the
+		remainder. The values passed to the returned function are interpreted as
+		parameter overrides, and the result is identical to that of
+		:python:`p(param, **params)` with the parameters in `wrt` overridden
+		(including the checking of any bounds). For example:
+
+		>>> p << {'x': 2, 'y': lambda x: expensive(x), 'z': lambda y,t: y*t}
+		>>> f = p.specialise('z', 't')
+		>>> f(1), f(2) # `expensive` is only called once
+
+		.. note:: The returned function does not reflect subsequent changes to the
+			parameters. If any of the parameters in `wrt` are invertible functions,
+			no parameters are pre-evaluated.
+		'''
+		wrt = tuple(self.__get_pam_name(pam) for pam in wrt)
+		self.__process_override(params)
+
+		def unspecialised(*values):
+			kwargs = params.copy()
+			kwargs.update(zip(wrt, values))
+			return self.__get((param,), kwargs)
+
+		if isinstance(param, str_types) and not self.__is_valid_param(param) or type(param).__module__.startswith('sympy'):
+			param = self.optimise(param)
+		for pam in wrt:
+			if type(self.__parameters.get(pam)) is types.FunctionType and pam in self.__get_pam_deps(pam):
+				return unspecialised
+
+		keys = params.copy()
+		keys.update((pam, None) for pam in wrt)
+		plan = self.__compile_plan([param], keys, self.__default_scaled)
+		if plan is None:
+			return unspecialised
+		instructions, outputs = plan
+
+		# Identify instructions which depend upon the parameters in `wrt`
+		varying = []
+		for op, pam, scaled, extra in instructions:
+			if op == _PLAN_OVERRIDE:
+				varying.append(pam in wrt)
+			elif op == _PLAN_FUNCTION:
+				varying.append(any(varying[slot] for slot in extra[1]))
+			elif op == _PLAN_CONVERT:
+				varying.append(varying[extra])
+			else:
+				varying.append(False)
+
+		# Evaluate the remainder once, and freeze their values
+		constants = []
+		for i, (op, pam, scaled, extra) in enumerate(instructions):
+			constants.append((_PLAN_CONSTANT, pam, scaled, None) if varying[i] else (op, pam, scaled, extra))
+		values = self.__run_plan(constants, params)
+		for i, (op, pam, scaled, extra) in enumerate(instructions):
+			if not varying[i]:
+				instructions[i] = (_PLAN_CONSTANT, pam, scaled, values[i])
+		output = outputs[0][1]
+
+		def specialised(*values):
+			kwargs = params.copy()
+			kwargs.update(zip(wrt, values))
+			self.__process_override(kwargs)
+			# Overrides which remain functions, or which override further
+			# parameters, are not accounted for by the specialised plan
+			if len(kwargs) != len(params) + len(wrt) or any(type(kwargs[pam]) is types.FunctionType for pam in wrt):
+				return unspecialised(*values)
+			result = self.__run_plan(instructions, kwargs)[output]
+			if self.__parameters_bounds is not None:  # As in `__get`
+				kwargs[param] = result
+				self.__forward_check_bounds((param,), kwargs)
+			return result
+		return specialised
+
+	def compile(self, outputs, wrt=(), **params):
+		'''
+		compile(outputs, wrt=(), **params)
+
+		:param outputs: A parameter name or symbolic expression, or a list of them, to be computed.
+		:type outputs: str or list of str
+		:param wrt: Parameters which should become the arguments of the generated function.
+		:type wrt: tuple of str
+		:param params: Parameter overrides to use when evaluating parameters which do not depend on those in `wrt`.
+		:type params: dict
+
+		:returns: A python function of the (scaled) values of the parameters in `wrt`, which returns the scaled value of `outputs` (or a tuple of such values if `outputs` is a list).
+
+		Whereas :func:`optimise` only converts a single expression into a function,
+		this method walks the entire dependency graph of `outputs`. Parameters
+		which do not depend upon those in `wrt` are evaluated once (subject to
+		the overrides in `params`), parameters defined by symbolic expressions
+		are inlined, and a single python function is generated which evaluates
+		the remainder using numpy, without any parameter lookups or unit
+		conversions. The arguments of this function may be scalars or numpy arrays.
+		For example:
+
+		>>> p(x=2, y='x*t^2', z=lambda y,t: y + t)
+		>>> f = p.compile(['y','z'], wrt=['t'])
+		>>> f(np.linspace(0,1,5))
+		(array([ 0.   ,  0.125,  0.5  ,  1.125,  2.   ]), array([ 0.   ,  0.375,  1.   ,  1.875,  3.   ]))
+
+		Parameters defined by python functions are called as is (being passed
+		:class:`Quantity` objects if they request unscaled arguments). Outputs
+		which do not depend upon the parameters in `wrt` are returned as constants.
+
+		.. note:: The generated function is independent of this Parameters instance,
+			and so does not reflect subsequent changes to parameter values. Parameter
+			bounds are also not checked by the generated function.
+		'''
+		single = isinstance(outputs, str_types)
+		if single:
+			outputs = [outputs]
+		wrt = [self.__get_pam_name(pam) for pam in wrt]
+		self.__process_override(params)
+
+		sympy = _sympy()
+		namespace = _lambdify_namespace()
+		# Values are converted to and from units, but are not checked against bounds
+		namespace['_scaled'] = lambda param, value: self.__get_quantity(value, param=param, scaled=True, bounds=False)
+		namespace['_quantity'] = lambda param, value: self.__get_quantity(value, param=param, bounds=False)
+		printer = sympy.printing.lambdarepr.NumPyPrinter()
+		statements = []
+		nodes = {}
+		visiting = set()
+
+		def constant(value):
+			name = '_c%d' % len(namespace)
+			namespace[name] = value
+			return name, False
+
+		def node(pam, f=None):
+			'''
+			Returns the name of the variable holding the scaled value of `pam`
+			in the generated function, and whether it depends upon `wrt`.
+			'''
+			if pam in nodes:
+				return nodes[pam]
+			if pam in visiting:
+				raise errors.ParameterRecursionError("Evaluating '%s' would result in recursion." % pam)
+			visiting.add(pam)
+
+			if pam in wrt:
+				result = pam, True
+			elif f is None and (pam in params or type(self.__parameters.get(pam)) is not types.FunctionType):
+				result = constant(self.__get_param(pam, params, True))
+			else:
+				result = function(pam, self.__parameters[pam] if f is None else f)
+
+			visiting.discard(pam)
+			nodes[pam] = result
+			return result
+
+		def function(pam, f):
+			args = self.__function_getargs(f)
+			if len(args) > 0 and self.__get_pam_name(args[-1]) == pam:
+				args = args[:-1]  # Drop argument used for inversion
+
+			deps = []
+			for arg in args:
+				scaled = self.__default_scaled if arg[:1] != '_' else not self.__default_scaled
+				deps.append((arg, self.__get_pam_name(arg), scaled) + node(self.__get_pam_name(arg)))
+
+			if not any(dep[4] for dep in deps):
+				return constant(self.__get_param(pam, params, True))
+
+			expression = getattr(f, 'expression', None)
+			if isinstance(expression, sympy.Basic) and all(dep[2] for dep in deps):
+				code = printer.doprint(expression.xreplace(dict((sympy.Symbol(arg), sympy.Symbol(var)) for arg, _, _, var, _ in deps)))
+			else:
+				name = '_f%d' % len(namespace)
+				namespace[name] = f
+				code = '_scaled(%r, %s(%s))' % (pam, name, ', '.join(var if scaled else '_quantity(%r, %s)' % (dep, var) for _, dep, scaled, var, _ in deps))
+
+			name = '_v%d' % len(statements)
+			statements.append('\t%s = %s' % (name, code))
+			return name, True
+
+		results = []
+		for output in outputs:
+			if isinstance(output, str_types) and self.__is_valid_param(output):
+				results.append(node(self.__get_pam_name(output))[0])
+			else:
+				results.append(node(output, self.optimise(output))[0])
+
+		source = 'from __future__ import division\ndef compiled(%s):\n%s\n\treturn %s\n' % (', '.join(wrt), '\n'.join(statements), results[0] if single else '(%s,)' % ', '.join(results))
+		exec(compile(source, '<compiled parameters>', 'exec'), namespace)
+		return namespace['compiled']
+
 	def is_resolvable(self, *args, **params):
 		'''
 		is_resolvable(*args, **params)
@@ -1771,12 +3119,12 @@ class Parameters(object):
 		param_val = None
 
 		if param_name in params:
-			param_val = params[param]
+			param_val = params[param_name]
 		elif param_name in self.__parameters:
-			param_val = self.__parameters[param]
+			param_val = self.__parameters[param_name]
 		else:
 			try:
-				symbols = sympy.S(param, sympy.abc._clash).free_symbols
+				symbols = self.__get_expression(param)[1]
 				for symbol in symbols:
 					if str(symbol) != str(param):
 						return True
@@ -1812,47 +3160,91 @@ class Parameters(object):
 		'''
 		if len(wrt) == 0:
 			return True
-		if param in wrt:
-			return False
 
+		wrt = [self.__get_pam_name(pam) for pam in wrt]
 		param_name = self.__get_pam_name(param)
-		param_val = None
 
-		if param_name in params:
-			param_val = params[param]
-		elif param_name in self.__parameters:
-			param_val = self.__parameters[param]
+		if param_name in params or param_name in self.__parameters or param_name in wrt:
+			dependencies = [param_name]
 		else:
 			try:
-				symbols = sympy.S(param, sympy.abc._clash).free_symbols
-				for symbol in symbols:
-					if str(symbol) != str(param_val):
-						if not self.is_constant(str(symbol), *wrt, **params):
-							return False
-				return True
-			except errors.ParameterInvalidError as e:
-				raise e
-			except:
+				dependencies = [self.__get_pam_name(str(symbol)) for symbol in self.__get_expression(param)[1]]
+			except errors.SymbolicEvaluationError:
 				raise errors.ParameterInvalidError("This parameters instance has no parameter named '%s', and none was provided. Parameter may or may not be constant." % param)
+			for dependency in dependencies:
+				if dependency not in params and dependency not in self.__parameters and dependency not in wrt:
+					raise errors.ParameterInvalidError("This parameters instance has no parameter named '%s', and none was provided. Parameter may or may not be constant." % dependency)
 
-		if isinstance(param_val, str_types):
-			param_val = self.optimise(param_val)
-		else:
-			param_val = self.__get_quantity(param_val)
+		varying = self.__graph_varying(wrt, params)
+		for dependency in dependencies:
+			if dependency in varying:
+				return False
+		return True
 
-		if isinstance(param_val, Quantity):
-			return True
-		elif isinstance(param_val, types.FunctionType):
-			deps = self.__function_getargs(param_val)
-			for dep in deps:
-				dep = self.__get_pam_name(dep)
-				if dep == param:
-					continue
-				if dep in wrt or not self.is_constant(dep, *wrt, **params):
-					return False
-			return True
-		else:
-			raise ValueError("Unable to check whether parameter '%s' of type '%s' is constant." % (param_val, type(param_val)))
+	################## INSTRUMENTATION ######################################
+
+	def stats(self, enabled=None, reset=False):
+		'''
+		stats(enabled=None, reset=False)
+
+		:param enabled: :python:`True` to start collecting statistics, :python:`False` to stop collecting them, or :python:`None` to leave collection unchanged.
+		:type enabled: bool or None
+		:param reset: :python:`True` if the statistics collected so far should be discarded.
+		:type reset: bool
+
+		:returns: A :class:`Statistics` instance of the statistics collected so far.
+
+		When enabled, Parameters instances record (for each parameter) how often
+		and for how long its function is evaluated, how often and for how long
+		overrides of it are processed, how often and for how long its bounds are
+		checked, and how often its scaled value and function cache (see :func:`cache`)
+		are hit or missed; along with the hit rate of the cache of unit scalings.
+		This makes it straightforward to target :func:`cache` and :func:`optimise`
+		at the parameters that dominate runtime. For example:
+
+		>>> p.stats(enabled=True)
+		>>> p.range('y', x=(0, 1, 1000))
+		>>> print(p.stats())
+
+		Printing the returned object renders a table of the statistics, with the
+		most expensive parameters first; but it is otherwise a dictionary of
+		counters with parameter names as keys. Collection is disabled by default,
+		and costs nothing when disabled. For scoped collection, see :func:`profile`.
+		'''
+		if reset:
+			data = Statistics()
+			if self.__stats is self.__stats_data:
+				self.__stats = data
+			self.__stats_data = data
+		if enabled is True:
+			self.__stats = self.__stats_data
+		elif enabled is False:
+			self.__stats = None
+		return self.__stats_data
+
+	@contextlib.contextmanager
+	def profile(self):
+		'''
+		profile()
+
+		:returns: A context manager, which yields a new :class:`Statistics` instance.
+
+		Statistics (see :func:`stats`) are collected into the yielded
+		:class:`Statistics` instance only while the context is active. For example:
+
+		>>> with p.profile() as stats:
+		>>> 	p('y', x=1)
+		>>> print(stats)
+
+		Statistics collected within the context are not added to those returned by
+		:func:`stats`.
+		'''
+		previous = self.__stats
+		self.__stats = stats = Statistics()
+		try:
+			yield stats
+		finally:
+			self.__stats = previous
 
 	################## PLOTTING INTROSPECTION ##############################
 
@@ -1918,6 +3310,11 @@ class Parameters(object):
 		return '_{'.join(s) + '}' * (len(s) - 1)
 
 	################## LOAD / SAVE PROFILES ################################
+	# Profiles are saved as JSON documents, with array values larger than
+	# `_SIDECAR_SIZE` stored alongside in `.npy` files (which are memory-mapped
+	# when loaded, so that many processes loading the same profile share pages).
+	# Legacy profiles, which are Python files defining the same variables, can
+	# still be loaded.
 
 	@classmethod
 	def load(cls, filename, **kwargs):
@@ -1934,35 +3331,78 @@ class Parameters(object):
 		This is the method you should use to load a saved :class:`Parameters`
 		configuration. For example:
 
-		>>> p.load('params.py')
+		>>> p.load('params.json')
 
-		The file being loaded should be a valid Python file, with one or more of
-		the following variables available in the global namespace:
-			- :python:`parameters` : a dictionary of parameter values with names as keys.
-			- :python:`parameters_cache` : a dictionary of boolean values with names as keys (and where True indicates that the parameter should be cached, see :func:`cache`).
+		Profiles are usually created using :python:`p >> 'params.json'`, and
+		consist of a JSON document with one or more of the following keys:
+			- :python:`parameters` : a dictionary of parameter definitions with names as keys, each of which is a dictionary with a :python:`units` key and one of: a :python:`value` key (a number, or :python:`{"real": .., "imag": ..}` for complex numbers); an :python:`array` key (a dictionary with a :python:`data` list and :python:`dtype`, or a :python:`file` key naming a `.npy` file relative to the profile); or an :python:`expression` key (the source of a symbolic expression).
+			- :python:`parameters_cache` : a dictionary of boolean values or integer cache capacities with names as keys (and where True indicates that the parameter should be cached with the default capacity, see :func:`cache`).
 			- :python:`parameters_units` : a dictionary of parameter units with names as keys (only necessary to specify units for parameters which do not have a value attached to them, but for which it is useful to have default units)
 			- :python:`dimension_scalings` : a dictionary of scalings with dimensions as keys (for valid scalings, see :func:`scaling`).
-			- :python:`units_custom` : a list of dictionaries which contain the kwargs necessary to construct the custom unit (seel :func:`add_unit`).
+			- :python:`units_custom` : a list of dictionaries which contain the kwargs necessary to construct the custom unit (see :func:`unit_add`).
+			- :python:`units_context` : a list of the name and parameters of the units context to use (see :func:`set_units_context`).
+
+		Array values stored in `.npy` files are memory-mapped read-only, and so
+		are loaded lazily and shared between processes loading the same profile.
+
+		Legacy profiles, which are Python files defining the above as global
+		variables (with :python:`parameters` having any values accepted by
+		:python:`p << parameters`), are also supported.
 		'''
-		profile = imp.load_source('profile', filename)
+		with open(filename) as f:
+			source = f.read()
+		try:
+			profile = json.loads(source)
+		except ValueError:
+			import imp
+			profile = vars(imp.load_source('profile', filename))
+			parameters = profile.get('parameters', {})
+		else:
+			if not isinstance(profile, dict):
+				raise errors.ParametersException("Profile '%s' is not a valid Parameters profile." % filename)
+			parameters = {}
+			for pam, spec in profile.get('parameters', {}).items():
+				parameters[str(pam)] = cls.__load_value(spec, os.path.dirname(os.path.abspath(filename)))
+			profile['dimension_scalings'] = dict((dimension, tuple(scaling)) for dimension, scaling in profile.get('dimension_scalings', {}).items())
 
 		p = cls(**kwargs)
 
-		p.scaling(**getattr(profile, "dimension_scalings", {}))
-
-		for unit in getattr(profile, "units_custom", []):
+		for unit in profile.get("units_custom", []):
+			if isinstance(unit, dict) and isinstance(unit.get('dimensions'), dict):
+				unit = dict(unit, dimensions=dict((dim, Fraction(power) if isinstance(power, str_types) else power) for dim, power in unit['dimensions'].items()))
 			p + unit
 
-		p << getattr(profile, "parameters", {})
+		p.scaling(**profile.get("dimension_scalings", {}))
+
+		p << parameters
 
-		p.cache(**getattr(profile, "parameters_cache", {}))
+		p.cache(**profile.get("parameters_cache", {}))
 
-		p & getattr(profile, "parameters_units", {})
+		p & profile.get("parameters_units", {})
 
-		p.set_units_context(getattr(profile, "units_context", None))
+		context = profile.get("units_context")
+		if context is not None:
+			p.set_units_context(context[0], **context[1])
 
 		return p
 
+	@staticmethod
+	def __load_value(spec, path):
+		units = spec.get('units')
+		if 'expression' in spec:
+			value = spec['expression']
+		elif 'array' in spec:
+			array = spec['array']
+			if 'file' in array:
+				value = np.load(os.path.join(path, array['file']), mmap_mode='r')
+			else:
+				value = np.array(array['data'], dtype=array.get('dtype'))
+		else:
+			value = spec['value']
+			if isinstance(value, dict):
+				value = complex(value['real'], value['imag'])
+		return value if units is None else (value, units)
+
 	def __rshift__(self, other):
 
 		if not isinstance(other, str_types):
@@ -1972,44 +3412,85 @@ class Parameters(object):
 		return self
 
 	def __save__(self, filename):
-		f = open(filename, 'w')
-
-		# Export unit context
-		if self.units_context is not None:
-			f.write('units_context = %s' % self.units_context)
-
-		# Export dimension scalings
-		f.write("dimension_scalings = {\n")
-		for dimension, scaling in self.__scalings.items():
-			f.write("\t\"%s\": (%s,\"%s\"),\n" % (dimension, scaling.value, scaling.units))
-		f.write("}\n\n")
-
-		# Export custom units
-		f.write("units_custom = {\n")
-		for unit in self.__units_custom:
-			f.write("%s,\n" % unit)
-		f.write("}\n\n")
-
-		# Export parameters
-		f.write("parameters = {\n")
+		'''
+		Save this instance as a JSON profile (see `load`), storing large array
+		values in `.npy` files alongside `filename`. Function parameters are
+		saved only if they are symbolic expressions; others are omitted with
+		a warning.
+		'''
+		parameters = {}
+		sidecars = set()
 		for pam, value in self.__parameters.items():
-			f.write("\t\"%s\": (%s,\"%s\"),\n" % (pam, value.value, value.units))
-		f.write("}\n\n")
-
-		# Export parameters_cache
-		f.write("parameters_cache = {\n")
-		for pam in self.__cache_funcs:
-			f.write("\t\"%s\": True,\n" % (pam))
-		f.write("}\n\n")
-
-		# Export parameters_units
-		f.write("parameters_units = {\n")
-		for pam, units in self.__parameters_spec.items():
-			if pam not in self.__parameters:
-				f.write("\t\"%s\": \"%s\",\n" % (pam, units))
-		f.write("}\n\n")
-
-		f.close()
+			units = self.__parameters_spec.get(pam)
+			if isinstance(value, types.FunctionType):
+				if not hasattr(value, 'expression'):
+					warnings.warn(errors.ParameterNotSavedWarning("Parameter '%s' is defined by a Python function rather than a symbolic expression, and so cannot be saved." % pam))
+					continue
+				spec = {'expression': str(value.expression)}
+			elif isinstance(value, Quantity):
+				units = value.units
+				spec = self.__save_value(filename, pam, value.value)
+			else:
+				spec = self.__save_value(filename, pam, value)
+			if 'file' in spec.get('array', ()):
+				sidecars.add(spec['array']['file'])
+			spec['units'] = None if units is None else str(units)
+			parameters[pam] = spec
+
+		profile = {
+			'dimension_scalings': dict((dimension, (scaling.value, str(scaling.units))) for dimension, scaling in self.__scalings.items()),
+			'units_custom': [self.__save_unit(unit) for unit in self.__units_custom],
+			'parameters': parameters,
+			'parameters_cache': dict((pam, cache.capacity) for pam, cache in self.__cache_funcs.items()),
+			'parameters_units': dict((pam, str(units)) for pam, units in self.__parameters_spec.items() if pam not in self.__parameters and units is not None),
+			'units_context': self.units_context,
+		}
+
+		source = json.dumps(profile, indent=4, sort_keys=True)
+		with open(filename, 'w') as f:
+			f.write(source)
+
+		# Remove sidecars of parameters which are no longer saved in them
+		path, basename = os.path.split(os.path.abspath(filename))
+		pattern = re.compile(r'^%s\.[^.]+\.npy$' % re.escape(basename))
+		for sidecar in os.listdir(path):
+			if pattern.match(sidecar) and sidecar not in sidecars:
+				os.remove(os.path.join(path, sidecar))
+
+	def __save_value(self, filename, pam, value):
+		if isinstance(value, np.ndarray) and value.ndim > 0:
+			# Object arrays cannot be memory-mapped, and so are always stored inline
+			if value.dtype.kind == 'O' or value.size <= _SIDECAR_SIZE and value.dtype.kind in 'biuf':
+				return {'array': {'data': value.tolist(), 'dtype': value.dtype.str}}
+			# Sidecars are written to a temporary file and then moved into place, so
+			# that arrays memory-mapped from an existing sidecar (such as those of
+			# a loaded profile being saved again) remain valid.
+			path, basename = os.path.split(os.path.abspath(filename))
+			sidecar = '%s.%s.npy' % (basename, pam)
+			fd, tmp = tempfile.mkstemp(prefix='.%s.' % sidecar, dir=path)
+			try:
+				with os.fdopen(fd, 'wb') as f:
+					np.save(f, value)
+				os.rename(tmp, os.path.join(path, sidecar))
+			except:
+				os.remove(tmp)
+				raise
+			return {'array': {'file': sidecar}}
+		if isinstance(value, np.generic):
+			value = value.item()
+		if isinstance(value, complex):
+			return {'value': {'real': value.real, 'imag': value.imag}}
+		return {'value': value}
+
+	def __save_unit(self, unit):
+		return {
+			'name': list(unit.names),
+			'abbr': None if unit.abbrs is None else list(unit.abbrs),
+			'rel': unit.rel,
+			'prefixable': unit.prefixable,
+			'plural': unit.plural,
+			'dimensions': dict((dim, str(power) if isinstance(power, Fraction) else power) for dim, power in unit.dimensions.items()),
+		}
 
 
 class Bounds(object):
@@ -2046,3 +3527,74 @@ class Bounds(object):
 		self.error = error
 		self.clip = clip
 		self.inclusive = inclusive
+
+
+class Statistics(dict):
+	'''
+	Statistics()
+
+	The :class:`Statistics` object is used by a :class:`Parameters` instance to
+	collect statistics about the evaluation of parameters (see :func:`Parameters.stats`).
+	It is a dictionary with parameter names as keys, and dictionaries of the
+	following counters as values:
+		- `evaluations` and `time`: The number of evaluations of the parameter's function (not including values retrieved from its function cache), and the total time spent in them (in seconds).
+		- `overrides` and `override_time`: The number of queries overriding the parameter, and the total time spent processing the overrides of these queries.
+		- `bounds_checks` and `bounds_time`: The number of checks of the parameter's bounds, and the total time spent in them.
+		- `scaled_hits` and `scaled_misses`: The number of hits and misses of the cache of the scaled value of the parameter.
+		- `cache_hits` and `cache_misses`: The number of hits and misses of the function cache of the parameter (see :func:`Parameters.cache`).
+
+	The number of hits and misses of the cache of unit scalings are available
+	as the attributes `scaling_hits` and `scaling_misses`. Converting the object
+	to a string renders a table of these statistics.
+	'''
+
+	fields = ('evaluations', 'time', 'overrides', 'override_time', 'bounds_checks', 'bounds_time', 'scaled_hits', 'scaled_misses', 'cache_hits', 'cache_misses')
+
+	def __init__(self):
+		dict.__init__(self)
+		self.scaling_hits = 0
+		self.scaling_misses = 0
+
+	def __missing__(self, param):
+		# Parameters without statistics are not added by merely looking them up
+		return dict.fromkeys(self.fields, 0)
+
+	def __counters(self, param):
+		counters = self.get(param)
+		if counters is None:
+			counters = self[param] = dict.fromkeys(self.fields, 0)
+		return counters
+
+	def count(self, param, field):
+		self.__counters(param)[field] += 1
+
+	def timed(self, param, field, field_time, start):
+		counters = self.__counters(param)
+		counters[field] += 1
+		counters[field_time] += default_timer() - start
+
+	def __rate(self, hits, misses):
+		if hits + misses == 0:
+			return '-'
+		return '%.1f%%' % (100. * hits / (hits + misses))
+
+	def __str__(self):
+		columns = ('Parameter', 'Evaluations', 'Time (s)', 'Overrides', 'Override time (s)', 'Bounds checks', 'Bounds time (s)', 'Scaled hit rate', 'Cache hit rate')
+		rows = []
+		for param, c in sorted(self.items(), key=lambda item: -(item[1]['time'] + item[1]['override_time'] + item[1]['bounds_time'])):
+			rows.append((
+				param,
+				'%d' % c['evaluations'], '%.6f' % c['time'],
+				'%d' % c['overrides'], '%.6f' % c['override_time'],
+				'%d' % c['bounds_checks'], '%.6f' % c['bounds_time'],
+				self.__rate(c['scaled_hits'], c['scaled_misses']),
+				self.__rate(c['cache_hits'], c['cache_misses'])
+			))
+		widths = [max([len(column)] + [len(row[i]) for row in rows]) for i, column in enumerate(columns)]
+		lines = ['  '.join(column.ljust(width) for column, width in zip(columns, widths)).rstrip()]
+		lines.append('  '.join('-' * width for width in widths))
+		for row in rows:
+			lines.append('  '.join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
+		lines.append('')
+		lines.append('Unit scaling cache hit rate: %s (%d hits, %d misses)' % (self.__rate(self.scaling_hits, self.scaling_misses), self.scaling_hits, self.scaling_misses))
+		return '\n'.join(lines)
@@ -282,7 +282,7 @@ class Quantity(UnicodeMixin):
 		elif isinstance(other, Units):
 			other = 1.0 * other
 		try:
-			abs = self.absolute and (self.units.dimensions == {} or other.units.dimensions == {})
+			abs = self.absolute and (not self.units.dimension_vector or not other.units.dimension_vector)
 			units = self.units * other.units
 			return self._new(self.value * other.value, units, absolute=abs)
 		except AttributeError:
@@ -300,7 +300,7 @@ class Quantity(UnicodeMixin):
 		if isinstance(other, Quantity):
 			if self.absolute or other.absolute:
 				raise ValueError("Cannot divide absolute quantities.")
-			absolute = self.absolute and (self.units.dimensions == {} or other.units.dimensions == {})
+			absolute = self.absolute and (not self.units.dimension_vector or not other.units.dimension_vector)
 			units = self.units / other.units
 			return self._new(self.value / other.value, units, absolute=absolute)
 
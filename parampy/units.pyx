@@ -1,10 +1,66 @@
 from fractions import Fraction
-import re, types, inspect
+import collections, re, types, weakref
 
 from . import errors
 from .text import colour_text
 from .utility.compat import UnicodeMixin, str_types
 
+# The number of recently created Units objects kept alive by each registry of
+# interned Units objects (see `_UnitsRegistry`).
+_REGISTRY_RECENT = 256
+
+
+class _UnitsRegistry(dict):
+	'''
+	A registry of interned Units objects, which maps keys to weak references to
+	them, and removes keys whose Units objects are no longer referenced elsewhere.
+	The Units objects created most recently are also kept alive; so that those
+	which are repeatedly created and discarded (such as the units of
+	intermediate results) need not be recreated each time.
+	'''
+
+	def __init__(self):
+		dict.__init__(self)
+		self.recent = collections.deque(maxlen=_REGISTRY_RECENT)
+
+	def lookup(self, key):
+		ref = self.get(key)
+		return ref() if ref is not None else None
+
+	def intern(self, key, units):
+		existing = self.lookup(key)
+		if existing is not None:
+			return existing
+		registry = weakref.ref(self)
+		def remove(ref):
+			self = registry()
+			if self is not None and self.get(key) is ref:
+				del self[key]
+		self[key] = weakref.ref(units, remove)
+		self.recent.append(units)
+		return units
+
+# Interned Units objects and dimension indices for Units which are not
+# associated with any dispenser (see Units.__new__).
+_UNITS_REGISTRY = _UnitsRegistry()
+_DIMENSION_INDICES = {}
+
+# The largest denominator of the fractions to which float powers of units are
+# normalised (see `_normalise_power`).
+_POWER_DENOMINATOR = 1000
+
+# Normalised float powers (see `_normalise_power`), of which at most
+# `_POWER_CACHE_CAPACITY` are remembered.
+_NORMALISED_POWERS = {}
+_POWER_CACHE_CAPACITY = 1024
+
+# The maximum number of parsed unit strings cached by each dispenser.
+_PARSE_CACHE_CAPACITY = 1024
+
+# Fully populated UnitDispenser instances, by class, whose unit tables are
+# shared by new instances of classes with `_shared_tables` set (see
+# UnitDispenser.__init__). These instances are never modified.
+_PROTOTYPES = {}
 
 class Unit(UnicodeMixin):
 	'''
@@ -197,22 +253,111 @@ class UnitDispenser(UnicodeMixin):
 		>>> ud('km')
 	'''
 
+	# Whether the unit tables populated by `init_prefixes` and `init_units` are
+	# built once (upon first instantiation), and then shared copy-on-write by all
+	# instances of this class. This applies only to the class which sets it (and
+	# not to its subclasses, whose setup methods may depend upon their instances);
+	# and classes may only set it if these methods depend upon nothing but the class.
+	_shared_tables = False
+
 	def __init__(self):
+		self.__init_state()
+		if type(self).__dict__.get('_shared_tables', False):
+			self.__share(self.__prototype())
+		else:
+			self.__init_tables()
+			self.init_prefixes()
+			self.init_units()
+		self._modified = False
+
+	def __init_state(self):
+		# State which is private to each instance
+		self._context_current = False
+		self._conversion_table = {} # Conversion factors and maps between Units, by context (see UnitDispenser.conversion_factor)
+		self._conversion_hits = 0
+		self._conversion_misses = 0
+		self._scaling_table = {} # Scalings between dimensions, by context (see UnitDispenser.scale)
+
+		self.__parsed = {} # Units objects by string representation (see UnitDispenser.__call__)
+		self.__parsed_previous = {}
+		self._registry = _UnitsRegistry() # Interned Units objects (see Units.__new__)
+		self._dimension_indices = {} # Positions of dimensions in Units.dimension_vector
+		self.__shared = False
+		self._modified = False # Whether the tables have been modified since the dispenser was initialised
+
+	def __init_tables(self):
+		# State which may be shared between instances until it is modified (see UnitDispenser.copy)
 		self._dimensions = {}
 		self._units = {}
 		self._prefixes = []
+		self.__prefixed = {} # Prefixed units resolved on demand, by name (see UnitDispenser.get)
+		self.__prefixed_units = {} # Prefixed units, by base unit and prefix index
 
 		self._contexts = {}
-		self._context_current = False
-		self._scalings = {}
-		self._conversions = {}
-		self.__convertable_units = []
-		self.__conversions_cache = {}
+		self._scalings = {} # Graph of scalings between dimensions, by context (see UnitDispenser.add_scaling)
+		self._conversions = {} # Conversion maps, by context and base unit signature (see UnitDispenser.add_conversion_map)
+		self.__convertable_units = set()
+
+	def __prototype(self):
+		cls = type(self)
+		prototype = _PROTOTYPES.get(cls)
+		if prototype is None:
+			prototype = cls.__new__(cls)
+			prototype.__init_state()
+			prototype.__init_tables()
+			prototype.init_prefixes()
+			prototype.init_units()
+			prototype = _PROTOTYPES.setdefault(cls, prototype)
+		return prototype
+
+	def __share(self, other):
+		self._dimensions = other._dimensions
+		self._units = other._units
+		self._prefixes = other._prefixes
+		# Prefixed units resolved by any sharing instance are valid for all of them
+		self.__prefixed = other.__prefixed
+		self.__prefixed_units = other.__prefixed_units
+
+		self._contexts = other._contexts
+		self._scalings = other._scalings
+		self._conversions = other._conversions
+		self.__convertable_units = other.__convertable_units
+		self.__shared = other.__shared = True
+
+	def __unshare(self):
+		self._dimensions = self._dimensions.copy()
+		self._units = self._units.copy()
+		self._prefixes = list(self._prefixes)
+		self.__prefixed = self.__prefixed.copy()
+		self.__prefixed_units = self.__prefixed_units.copy()
+
+		self._contexts = self._contexts.copy()
+		self._scalings = dict((context, dict((dims, edges.copy()) for dims, edges in graph.items())) for context, graph in self._scalings.items())
+		self._conversions = dict((context, dict((signature, list(conversions)) for signature, conversions in index.items())) for context, index in self._conversions.items())
+		self.__convertable_units = set(self.__convertable_units)
+		self.__shared = False
+
+	def copy(self):
+		'''
+		copy()
+
+		:returns: A new dispenser of the same type, with the same units, prefixes, basis, contexts, scalings and conversion maps as this dispenser.
 
-		self.__cache = {}
+		Copying is cheap, as the unit tables of both dispensers are shared until
+		either of them is modified; at which point the modified dispenser takes a
+		private copy. :class:`Units` objects are not shared, and so those drawn
+		from the new dispenser are distinct from (but equal to) those drawn from
+		this one.
+		'''
+		other = type(self).__new__(type(self))
+		other.__init_state()
+		other.__share(self)
+		other._context_current = self._context_current
+		other._modified = self._modified
+		return other
 
-		self.init_prefixes()
-		self.init_units()
+	def __copy__(self):
+		return self.copy()
 
 	############# SETUP ROUTINES ###########################################
 	def init_prefixes(self):
@@ -257,17 +402,31 @@ class UnitDispenser(UnicodeMixin):
 
 		>>> ud + Unit('metre',abbr='m',rel=1.0).set_dimensions(length=1,mass=-2) + .....
 
-		.. warning:: When adding a unit, the dispenser will replace any existing unit by the same name; and that if Unit.prefixable is True, then it will add the unit as well as all possible prefixed versions of that unit.
+		.. warning:: When adding a unit, the dispenser will replace any existing unit by the same name; and that if Unit.prefixable is True, then all possible prefixed versions of that unit will also be recognised. Prefixed units are created on demand when first looked up (see :func:`get`), and never take precedence over explicitly added units.
 		'''
 		if not isinstance(unit, Unit):
 			raise errors.UnitInvalidError("A Unit object is required for addition to a UnitDispenser. Was provided with: '%s'." % unit)
 
+		if self.__shared:
+			self.__unshare()
+		self._modified = True
+		self.__parsed, self.__parsed_previous = {}, {}
+		self._conversion_table = {}
+
 		for name in unit.names:
 			self._units[name] = unit
 		if unit.abbr != None:
 			for abbr in unit.abbrs:
 				self._units[abbr] = unit
 
+		# Forget any prefixed units that might now resolve differently
+		if self.__prefixed:
+			suffixes = tuple(unit.names) + tuple(unit.abbrs or ())
+			for name in [name for name in self.__prefixed if name.endswith(suffixes)]:
+				del self.__prefixed[name]
+			for key in [key for key in self.__prefixed_units if key[0] is not self._units.get(key[0].name)]:
+				del self.__prefixed_units[key]
+
 		for dimension in unit.dimensions:
 			if dimension not in self._dimensions or self._dimensions[dimension] is None:
 				if unit.dimensions == {dimension: 1}:
@@ -275,23 +434,10 @@ class UnitDispenser(UnicodeMixin):
 				else:
 					self._dimensions[dimension] = None
 		if check:
-			for dimension, basis_unit in self.basis().items():
+			for dimension, basis_unit in self._dimensions.items():
 				if basis_unit is None:
 					print colour_text("WARNING: No basis unit specified for: %s." % dimension)
 
-		if unit.prefixable:
-			for prefix in self._prefixes:
-				self.add(
-					Unit(
-						name=self.__generate_units(unit.names, prefix[0]),
-						abbr=self.__generate_units(unit.abbrs, prefix[1]),
-						plural=self.__generate_units(unit.plural, prefix[0]),
-						rel=unit.rel * prefix[2],
-						prefixable=False,
-						base_unit=unit
-					).set_dimensions(**unit.dimensions),
-					check=False)
-
 		return self
 
 	def add_context(self, *name, **params):
@@ -301,7 +447,13 @@ class UnitDispenser(UnicodeMixin):
 		else:
 			assert(len(name) == 1)
 			name = name[0]
+		if self.__shared:
+			self.__unshare()
+		self._modified = True
 		self._contexts[name] = params
+		self._conversion_table.pop(name, None)
+		self._conversion_table.pop(False, None)
+		self._scaling_table = {}
 
 	def set_context(self, *name, **params):
 		assert(len(name) == 1)
@@ -316,8 +468,16 @@ class UnitDispenser(UnicodeMixin):
 			if p in params:
 				ps[p] = params[p]
 
+		# Context parameters may have changed, as may the current context; and
+		# factors and scalings for the previous context may depend upon its parameter
+		# overrides (which apply only while it is current, see `__eval_context_function`).
+		previous = self._context_current[0] if self._context_current is not False else None
 		self._context_current = (name, ps)
-		self.__cache = {}
+		self._conversion_table.pop(name, None)
+		self._conversion_table.pop(previous, None)
+		self._conversion_table.pop(False, None)
+		self._scaling_table.pop(name, None)
+		self._scaling_table.pop(previous, None)
 
 	@property
 	def context(self):
@@ -351,14 +511,25 @@ class UnitDispenser(UnicodeMixin):
 		Will allow you to do:
 
 		>>> SIQuantity( 2, 'J' )('GHz', context='condensed_matter')
+
+		Scalings are composed where necessary, so that (for example) if scalings
+		from energy to frequency and from frequency to angular frequency are
+		known, energies can also be scaled to angular frequencies.
 		'''
 		assert(type(dim_from) == dict)
 		assert(type(dim_to) == dict)
+		if self.__shared:
+			self.__unshare()
+		self._modified = True
 		if context not in self._contexts:
 			self._contexts[context] = {}
-		if context not in self._scalings:
-			self._scalings[context] = []
-		self._scalings[context].append( (dim_from, dim_to, scaling) )
+		graph = self._scalings.setdefault(context, {})
+		dims_from, dims_to = _dimensions_key(dim_from), _dimensions_key(dim_to)
+		# Scalings added first take precedence
+		graph.setdefault(dims_from, {}).setdefault(dims_to, (scaling, 1))
+		graph.setdefault(dims_to, {}).setdefault(dims_from, (scaling, -1))
+		self._conversion_table = {}
+		self._scaling_table = {}
 
 	def is_scalable(self, dim_from, dim_to, context=False):
 		'''
@@ -393,6 +564,10 @@ class UnitDispenser(UnicodeMixin):
 
 		This method returns a float corresponding to a scaling from the
 		dimensions provided, as specified using `UnitDispenser.add_scaling`.
+		Scalings which require the composition of several scalings are found
+		using the fewest possible scalings; those specified for `context` being
+		preferred over those specified for no context. Scalings are cached until
+		scalings or contexts are added, or the parameters of the context are changed.
 		'''
 
 		if context is False:
@@ -401,17 +576,122 @@ class UnitDispenser(UnicodeMixin):
 			else:
 				context = None
 
-		if context in self._scalings:
-			for scaling in self._scalings[context]:
-				if dim_from == scaling[0] and dim_to == scaling[1]:
-					return self.__eval_context_function(scaling[2], context)
-				elif dim_from == scaling[1] and dim_to == scaling[0]:
-					return 1./self.__eval_context_function(scaling[2], context)
+		dims_from, dims_to = _dimensions_key(dim_from), _dimensions_key(dim_to)
+		table = self._scaling_table.get(context)
+		if table is None:
+			table = self._scaling_table[context] = {}
+		try:
+			factor = table[dims_from, dims_to]
+		except KeyError:
+			path = self.__scaling_path(dims_from, dims_to, context)
+			if path is None:
+				factor = None
+			else:
+				factor = 1.
+				for scaling, power, scaling_context in path:
+					value = self.__eval_context_function(scaling, scaling_context)
+					factor = factor * value if power > 0 else factor / value
+			table[dims_from, dims_to] = factor
+
+		if factor is None:
+			raise ValueError("No scaling between dimensions %s and %s are possible." % (dim_from, dim_to))
+		return factor
 
+	def __scaling_path(self, dims_from, dims_to, context):
+		'''
+		Return the shortest sequence of (scaling, power, context) tuples which
+		scales `dims_from` to `dims_to` in `context`, or None if there is none.
+		'''
+		graphs = [(context, self._scalings.get(context, {}))]
 		if context is not None:
-			return self.scale(dim_from, dim_to, context=None)
+			graphs.append((None, self._scalings.get(None, {})))
+
+		# Breadth-first search, recording the edge by which each dimension was reached
+		previous = {dims_from: None}
+		frontier = [dims_from]
+		while frontier and dims_to not in previous:
+			next_frontier = []
+			for dims in frontier:
+				for graph_context, graph in graphs:
+					for target, (scaling, power) in graph.get(dims, {}).items():
+						if target not in previous:
+							previous[target] = (dims, (scaling, power, graph_context))
+							next_frontier.append(target)
+			frontier = next_frontier
+
+		if dims_to not in previous or dims_from == dims_to:
+			return None
+		path = []
+		dims = dims_to
+		while previous[dims] is not None:
+			dims, edge = previous[dims]
+			path.append(edge)
+		return path[::-1]
+
+	def conversion_factor(self, units_from, units_to, context=False):
+		'''
+		conversion_factor(units_from, units_to, context=False)
+
+		:param units_from: The units from which to convert.
+		:type units_from: Units
+		:param units_to: The units to which to convert.
+		:type units_to: Units
+		:param context: The context in which to convert, or False for the current context.
+		:type context: str
+
+		:returns: The float by which to multiply a value in `units_from` to express it in `units_to`.
+		:raises: UnitConversionError if the dimensions of the units do not match, and no scaling between them has been specified using `UnitDispenser.add_scaling`.
 
-		raise ValueError("No scaling between dimensions %s and %s are possible." % (dim_from, dim_to))
+		Conversion factors are stored in a table shared by all :class:`Units`
+		objects drawn from this dispenser, which is invalidated only when units,
+		scalings or conversion maps are added (or when the parameters of a context
+		are changed). This method is used by :func:`Units.scale`.
+		'''
+		# Factors are stored by the context argument (so that the current context
+		# need not be looked up for cache hits), and by the Units objects; which
+		# are interned, and whose hashes are precomputed.
+		table = self._conversion_table.get(context)
+		if table is None:
+			table = self._conversion_table[context] = {}
+		key = (units_from, units_to)
+		try:
+			factor = table[key]
+			self._conversion_hits += 1
+			return factor
+		except KeyError:
+			self._conversion_misses += 1
+
+		if context is False:
+			context = self._context_current[0] if self._context_current is not False else None
+
+		if units_from.dimension_vector == units_to.dimension_vector:
+			factor = units_from.rel / units_to.rel
+		else:
+			try:
+				factor = units_from.rel / units_to.rel * self.scale(dim_from=units_from.dimensions, dim_to=units_to.dimensions, context=context)
+			except ValueError:
+				raise errors.UnitConversionError("Invalid conversion. Units '%s' and '%s' do not match." % (units_from, units_to))
+
+		table[key] = factor
+		return factor
+
+	def conversion_stats(self, reset=False):
+		'''
+		conversion_stats(reset=False)
+
+		:param reset: Whether to reset the statistics after returning them.
+		:type reset: bool
+
+		:returns: A dictionary with the number of `hits` and `misses` of the conversion table (see :func:`conversion_factor` and :func:`conversion_map`), along with its current `size`.
+		'''
+		stats = {
+			'hits': self._conversion_hits,
+			'misses': self._conversion_misses,
+			'size': sum(len(table) for table in self._conversion_table.values()),
+		}
+		if reset:
+			self._conversion_hits = self._conversion_misses = 0
+		return stats
 
 	def __eval_context_function(self, f, context, args=(), kwargs={}):
 		if not type(f) is types.FunctionType:
@@ -468,12 +748,16 @@ class UnitDispenser(UnicodeMixin):
 
 		'''
 		# TODO: Add checks
+		if self.__shared:
+			self.__unshare()
+		self._modified = True
 		if context not in self._contexts:
 			self._contexts[context] = {}
-		if context not in self._conversions:
-			self._conversions[context] = []
-		self._conversions[context].append( ( self(unit_from), self(unit_to), mapping, absolute) )
-		self.__convertable_units.append(self(unit_from))
+		unit_from, unit_to = self(unit_from), self(unit_to)
+		signature = (_base_unit_signature(unit_from), _base_unit_signature(unit_to), absolute)
+		self._conversions.setdefault(context, {}).setdefault(signature, []).append( (unit_from, unit_to, mapping, absolute) )
+		self.__convertable_units.add(unit_from)
+		self._conversion_table = {}
 
 	def has_conversion_map(self, unit_from, unit_to, absolute=False, context=False):
 		'''
@@ -529,51 +813,33 @@ class UnitDispenser(UnicodeMixin):
 			else:
 				context = None
 
-		check = False
-		try:
-			c = self.__conversions_cache[context][unit_from][unit_to][absolute]
-			if c is None:
-				check=False
-			else:
-				return c
-		except KeyError:
-			check = True
-
-		if check and context in self._conversions:
-			unit_from, unit_to = self(unit_from), self(unit_to)
-			m = lambda u: u.base_unit.name
-
+		table = self._conversion_table.setdefault(context, {})
+		key = (unit_from, unit_to, absolute)
+		if key in table:
+			self._conversion_hits += 1
+			c = table[key]
+		else:
+			self._conversion_misses += 1
 			c = None
-			for conversion in self._conversions[context]:
-				if conversion[-1] != absolute:
-					continue
+			# Only conversions between units with the same base units are candidates
+			signature = (_base_unit_signature(unit_from), _base_unit_signature(unit_to), absolute)
+			for conversion in self._conversions.get(context, {}).get(signature, ()):
 				# Try to convert current unit to stored unit
 				try:
-					assert(sorted(map(m, conversion[0].units.keys())) == sorted(map(m, unit_from.units.keys())))
-					assert(sorted(map(m, conversion[1].units.keys())) == sorted(map(m,unit_to.units.keys())))
 					pre_scaling = unit_from.scale(conversion[0])
 					post_scaling = unit_to.scale(conversion[1])
+				except errors.UnitConversionError:
+					continue
 
-					c = lambda v: self.__eval_context_function(conversion[2], context, args=[pre_scaling*v])/post_scaling
-
-					break
-
-				except:
-					pass
-
-			if context not in self.__conversions_cache:
-				self.__conversions_cache[context] = {}
-			if unit_from not in self.__conversions_cache[context]:
-				self.__conversions_cache[context][unit_from] = {}
-			if unit_to not in self.__conversions_cache[context][unit_from]:
-				self.__conversions_cache[context][unit_from][unit_to] = {}
-			self.__conversions_cache[context][unit_from][unit_to][absolute] = c
+				c = lambda v: self.__eval_context_function(conversion[2], context, args=[pre_scaling*v])/post_scaling
+				break
+			table[key] = c
 
-			if c is not None:
-				return c
+		if c is not None:
+			return c
 
 		if context is not None:
-			return self.conversion_map(unit_from, unit_to, context=None)
+			return self.conversion_map(unit_from, unit_to, absolute=absolute, context=None)
 
 		raise ValueError("No mapping known between %s and %s" % (unit_from, unit_to))
 
@@ -609,7 +875,13 @@ class UnitDispenser(UnicodeMixin):
 
 		Note that no particular order is guaranteed for this list.
 		'''
-		return self._units.keys()
+		units = set(self._units)
+		for unit in set(self._units.values()):
+			if unit.prefixable:
+				for prefix in self._prefixes:
+					units.update(self.__generate_units(unit.names, prefix[0]) or ())
+					units.update(self.__generate_units(unit.abbrs, prefix[1]) or ())
+		return list(units)
 
 	def has(self, identifier):
 		'''
@@ -624,6 +896,11 @@ class UnitDispenser(UnicodeMixin):
 
 		>>> ud.has('metre')
 		'''
+		try:
+			self.get(identifier)
+			return True
+		except errors.UnitInvalidError:
+			return False
 
 	def get(self, unit):
 		'''
@@ -634,16 +911,58 @@ class UnitDispenser(UnicodeMixin):
 
 		:returns: :class:`Unit` object associated with a the string representation.
 		:raises: :class:`UnitInvalidError` if no unit can be found that matches.
+
+		If the string representation is not that of a known unit, but is that
+		of a known prefixable unit with a known prefix (for example, "km"), then
+		the prefixed unit is created and remembered for future lookups.
 		'''
 		if isinstance(unit, str_types):
 			try:
 				return self._units[unit]
-			except:
+			except KeyError:
+				pass
+			try:
+				return self.__prefixed[unit]
+			except KeyError:
+				pass
+			prefixed = self.__get_prefixed(unit)
+			if prefixed is None:
 				raise errors.UnitInvalidError("Unknown unit: '%s'." % unit)
+			return prefixed
 		elif isinstance(unit, Unit):
 			return unit
 		raise errors.UnitInvalidError("Could not find Unit object for '%s'." % unit)
 
+	def __get_prefixed(self, name):
+		# Later prefixes are tried first, since they took precedence when prefixed
+		# units were generated eagerly.
+		for index in reversed(range(len(self._prefixes))):
+			prefix = self._prefixes[index]
+			for prefix_strings, attr in ((prefix[0], 'names'), (prefix[1], 'abbrs')):
+				if not type(prefix_strings) in (list, tuple):
+					prefix_strings = (prefix_strings,)
+				for prefix_string in prefix_strings:
+					if prefix_string is None or len(name) <= len(prefix_string) or not name.startswith(prefix_string):
+						continue
+					base_name = name[len(prefix_string):]
+					base = self._units.get(base_name)
+					if base is None or not base.prefixable or base_name not in (getattr(base, attr) or ()):
+						continue
+
+					prefixed = self.__prefixed_units.get((base, index))
+					if prefixed is None:
+						prefixed = self.__prefixed_units[(base, index)] = Unit(
+							name=self.__generate_units(base.names, prefix[0]),
+							abbr=self.__generate_units(base.abbrs, prefix[1]),
+							plural=self.__generate_units(base.plural, prefix[0]),
+							rel=base.rel * prefix[2],
+							prefixable=False,
+							base_unit=base
+						).set_dimensions(**base.dimensions)
+					self.__prefixed[name] = prefixed
+					return prefixed
+		return None
+
 	@property
 	def dimensions(self):
 		'''
@@ -651,7 +970,7 @@ class UnitDispenser(UnicodeMixin):
 
 		>>> ud.dimensions = ['length', 'mass', 'time']
 		'''
-		return self._dimensions.keys()
+		return list(self._dimensions)
 
 	def basis(self, **kwargs):
 		'''
@@ -676,8 +995,11 @@ class UnitDispenser(UnicodeMixin):
 		For more about how this useful, see the documentation for :python:`Quantity.basis`.
 		'''
 		if not kwargs:
-			return self._dimensions
+			return self._dimensions.copy()
 
+		if self.__shared:
+			self.__unshare()
+		self._modified = True
 		for key, val in kwargs.items():
 			unit = self.get(val)
 			if unit.dimensions == {key: 1}:
@@ -689,15 +1011,38 @@ class UnitDispenser(UnicodeMixin):
 
 	def __call__(self, units):
 		'''
-		This is a shortcut for: Units(units,dispenser=self); which also allows
-		for caching.
+		This is a shortcut for: Units(units,dispenser=self). String representations
+		of units are parsed once, and cached (up to a fixed number of recently used
+		strings) until units are added to the dispenser.
 		'''
-		if type(units) is str:
-			if units in self.__cache:
-				return self.__cache[units]
-			self.__cache[units] = Units(units, dispenser=self)
-			return self.__cache[units]
-		return Units(units, dispenser=self)
+		try:
+			return self.__parsed[units]
+		except (KeyError, TypeError):
+			pass
+		if not isinstance(units, str_types):
+			return Units(units, dispenser=self)
+
+		# Parsed units are cached in two generations, which approximates a least
+		# recently used cache whilst keeping hits as cheap as dictionary lookups.
+		# When the current generation is full, it replaces the previous generation;
+		# and entries found in the previous generation are promoted.
+		parsed = self.__parsed_previous.get(units)
+		if parsed is None:
+			parsed = Units(_parse_units(units, self), dispenser=self)
+		if len(self.__parsed) >= _PARSE_CACHE_CAPACITY // 2:
+			self.__parsed_previous, self.__parsed = self.__parsed, {}
+		self.__parsed[units] = parsed
+		return parsed
+
+	def __getstate__(self):
+		state = self.__dict__.copy()
+		# Repopulated as Units objects are unpickled
+		del state['_registry']
+		del state['_dimension_indices']
+		state['_UnitDispenser__parsed'], state['_UnitDispenser__parsed_previous'] = {}, {}
+		state['_conversion_table'] = {} # Repopulated upon demand
+		state['_UnitDispenser__shared'] = False # Tables are no longer shared once unpickled
+		return state
 
 	def __getattr__(self, name):
 		if name[:2] == "__" or name[:14] == "_UnitDispenser":
@@ -721,7 +1066,7 @@ class Units(UnicodeMixin):
 
 	Representation of units:
 		The unit representation passed to the :class:`Units` constructor can be:
-			- A Units object (in which case a copy is returned)
+			- A Units object (which is returned as is if it shares this dispenser)
 			- A Unit object (in which case it is upgraded to a :class:`Units` object)
 			- A string representing a units object
 			- A dictionary of Unit-power relationships
@@ -729,15 +1074,24 @@ class Units(UnicodeMixin):
 		A valid string representation is a string which consists of a series of
 		unit tokens (described below) separated by either a "* (for multiplication)
 		or a "/" (for division). Each unit token consists of a unit string
-		representation recognisable by a dispenser (for example: "ms" or "millisecond")
-		followed by an optional power; which is indicated by a caret "^" and a floating
-		point number (including integers). Importantly fractions are not supported in this
-		specification.
+		representation recognisable by a dispenser (for example: "ms" or "millisecond"),
+		a numeric factor (for example: "1000" or "1e-3"), or a parenthesised string
+		representation; followed by an optional power, which is indicated by a caret "^"
+		and either a floating point number (including integers) or a parenthesised
+		fraction (for example: "^(1/2)"). Numeric factors are collected into a single
+		dimensionless unit.
 
 		For example, here are some valid units string representations:
 			- "kg*m*s^-2"
 			- "ms/nm*kg^2"
 			- "/nm"
+			- "J/(kg*K)"
+			- "(m/s)^2"
+			- "1000*m"
+
+		Parsed string representations are cached by the dispenser (up to a fixed
+		number of recently used strings), so repeatedly specifying units by the
+		same string is cheap.
 
 		A valid dictionary of unit-power relationships is a mapping from :class:`Unit`
 		object keys (or their string representation) to a numeric power. For example:
@@ -781,6 +1135,14 @@ class Units(UnicodeMixin):
 		>>> u1 != u2
 		True
 
+		Units objects are interned, so that equivalent units drawn from the same
+		dispenser are represented by the same object, regardless of how they were
+		specified. Equality and hashing are therefore cheap, and Units objects can
+		be used efficiently as dictionary keys.
+
+		>>> ud('m*s') is Units({'s': 1, 'm': 1}, dispenser=ud)
+		True
+
 
 	There are a few useful methods though.
 
@@ -803,47 +1165,84 @@ class Units(UnicodeMixin):
 	>>> units.units
 	'''
 
-	def __init__(self, units=None, dispenser=None):
-		self.__hash = hash(str(units))
+	def __new__(cls, units=None, dispenser=None):
+		if isinstance(units, cls) and units.__dispenser is dispenser:
+			return units
+
+		if dispenser is not None and isinstance(units, str_types):
+			return dispenser(units)
+
+		units = cls.__process_units(units, dispenser)
+		if dispenser is None:
+			registry, indices = _UNITS_REGISTRY, _DIMENSION_INDICES
+		else:
+			# These are accessed via `__dict__` since they may not yet be populated while unpickling.
+			registry = dispenser.__dict__.get('_registry')
+			if registry is None:
+				registry = dispenser.__dict__['_registry'] = _UnitsRegistry()
+			indices = dispenser.__dict__.setdefault('_dimension_indices', {})
+		key = (cls, frozenset(units.items()))
+		ref = registry.get(key)
+		if ref is not None:
+			self = ref()
+			if self is not None:
+				return self
+
+		self = object.__new__(cls)
 		self.__dispenser = dispenser
-		self.__units = self.__process_units(units)
+		self.__units = units
+		self.__str = self.__render()
+		self.__hash = hash(self.__str)
+
+		dimensions = {}
+		rel = 1.
+		for unit, power in units.items():
+			rel *= unit.rel ** power
+			for dimension, order in unit.dimensions.items():
+				dimensions[dimension] = dimensions.get(dimension, 0) + power * order
+		vector = []
+		for dimension, power in list(dimensions.items()):
+			if power == 0:
+				del dimensions[dimension]
+				continue
+			if isinstance(power, Fraction) and power.denominator == 1:
+				dimensions[dimension] = power = int(power)
+			index = indices.setdefault(dimension, len(indices))
+			if index >= len(vector):
+				vector.extend([0] * (index + 1 - len(vector)))
+			vector[index] = power
+		self.__dimensions = dimensions
+		self.__dimension_vector = tuple(vector)
+		self.__rel = rel
 
-	def __get_unit(self, unit):
-		return self.__dispenser.get(unit)
+		return registry.intern(key, self)
 
-	def __process_units(self, units):
+	def __reduce__(self):
+		return (type(self), (self.__units, self.__dispenser))
+
+	@staticmethod
+	def __process_units(units, dispenser):
 
 		if units is None:
 			return {}
 
 		elif isinstance(units, Units):
-			return units.units.copy()
+			return units.units
 
 		elif isinstance(units, Unit):
 			return {units: 1}
 
 		elif isinstance(units, dict):
-			units = units.copy()
-			for unit in units.keys():
+			d = {}
+			for unit, power in units.items():
 				if type(unit) != Unit:
-					units[self.__get_unit(unit)] = Fraction(units.pop(unit))
-			return units
+					unit, power = _get_unit(unit, dispenser), Fraction(power)
+				if power != 0:
+					d[unit] = power if type(power) is int else _normalise_power(power)
+			return d
 
 		elif isinstance(units, str_types):
-			d = {}
-
-			if units == "units":
-				return d
-
-			for match in re.finditer("([*/])?([^*/\^0-9]+)(?:\^(\-?[0-9\.]+))?", units.replace(" ", "")):
-				groups = match.groups()
-				mult = -1 if groups[0] == "/" else 1
-				power = mult * (Fraction(groups[2]) if groups[2] is not None else 1)
-
-				unit = self.__get_unit(groups[1])
-				d[unit] = d.get(unit, 0) + power
-
-			return d
+			return Units.__process_units(_parse_units(units, dispenser), dispenser)
 
 		raise errors.UnitInvalidError("Unrecognised unit description %s" % units)
 
@@ -851,6 +1250,9 @@ class Units(UnicodeMixin):
 		return str(self)
 
 	def __unicode__(self):
+		return self.__str
+
+	def __render(self):
 		output = []
 
 		items = sorted(self.__units.items(), key=str)
@@ -858,7 +1260,7 @@ class Units(UnicodeMixin):
 		for unit, power in items:
 			if power > 0:
 				if power != 1:
-					output.append("%s^%s" % (unit.abbr, power))
+					output.append("%s^%s" % (unit.abbr, self.__render_power(power)))
 				else:
 					output.append(unit.abbr)
 		output = "*".join(output)
@@ -866,12 +1268,18 @@ class Units(UnicodeMixin):
 		for unit, power in items:
 			if power < 0:
 				if power != -1:
-					output += "/%s^%s" % (unit.abbr, abs(power))
+					output += "/%s^%s" % (unit.abbr, self.__render_power(abs(power)))
 				else:
 					output += "/%s" % unit.abbr
 
 		return output
 
+	@staticmethod
+	def __render_power(power):
+		if isinstance(power, Fraction) and power.denominator != 1:
+			return "(%s)" % power
+		return power
+
 	def scale(self, other, context=False, value=None):
 		'''
 		scale(other)
@@ -888,32 +1296,31 @@ class Units(UnicodeMixin):
 
 		E.g.: <km>.scale('m') -> 1000
 		'''
-		try:
-			return self.__scale_cache[other]
-		except:
-			if getattr(self, '__scale_cache', None) is None:
-				self.__scale_cache = {}
+		# Conversion factors between units drawn from the same dispenser are
+		# cached in its conversion table (see UnitDispenser.conversion_factor).
+		dispenser = self.__dispenser
+		if isinstance(other, Units) and other.__dispenser is dispenser:
+			try:
+				factor = dispenser._conversion_table[context][self, other]
+				dispenser._conversion_hits += 1
+				return factor
+			except (KeyError, AttributeError):  # AttributeError if there is no dispenser
+				pass
 
-			if isinstance(other, str_types):
-				other = self.__dispenser(other)
+		if isinstance(other, str_types):
+			other = dispenser(other)
 
-			dims = self.dimensions
-			dims_other = other.dimensions
+		if other.__dispenser is dispenser and dispenser is not None:
+			return dispenser.conversion_factor(self, other, context)
 
-			scale = None
+		if self.__dimensions != other.__dimensions:
+			if self.__dispenser is None:
+				raise errors.UnitConversionError("Invalid conversion. Units '%s' and '%s' do not match." % (self, other))
 			try:
-				scale = self.__dispenser.scale(dim_from=dims, dim_to=dims_other, context=context)
-			except ValueError as e:
-				pass
-
-			# If the union of the sets of dimensions is less than the maximum size of the dimensions; then the units are the same.
-			if scale is None:
-				if len(set(dims.items()) & set(dims_other.items())) < max(len(dims), len(dims_other)):
-					raise errors.UnitConversionError("Invalid conversion. Units '%s' and '%s' do not match. %s" % (self, other, set(dims.items()) & set(dims_other.items())))
-				self.__scale_cache[other] = self.rel / other.rel
-			else:
-				return self.rel / other.rel * scale # Don't cache if scaling was applied.
-			return self.__scale_cache[other]
+				return self.__rel / other.__rel * self.__dispenser.scale(dim_from=self.__dimensions, dim_to=other.__dimensions, context=context)
+			except ValueError:
+				raise errors.UnitConversionError("Invalid conversion. Units '%s' and '%s' do not match." % (self, other))
+		return self.__rel / other.__rel
 
 	@property
 	def dimensions(self):
@@ -923,16 +1330,21 @@ class Units(UnicodeMixin):
 		>>> u.dimensions
 		{'length': 1, 'time': 1}
 		'''
+		return self.__dimensions.copy()
 
-		dimensions = {}
-		for unit, power in self.__units.items():
-			for key, order in unit.dimensions.items():
-				dimensions[key] = dimensions.get(key, 0) + power * order
-		for key, value in list(dimensions.items()):
-			if value == 0:
-				del dimensions[key]
-
-		return dimensions
+	@property
+	def dimension_vector(self):
+		'''
+		An immutable tuple of the powers of each dimension known to the dispenser
+		(in the order in which they were first encountered, and with trailing
+		zeros omitted) for the units described by this object. Units drawn from the
+		same dispenser have the same dimensions if and only if their dimension vectors
+		are equal.
+
+		>>> u.dimension_vector
+		(1, 0, 1)
+		'''
+		return self.__dimension_vector
 
 	@property
 	def rel(self):
@@ -941,11 +1353,7 @@ class Units(UnicodeMixin):
 
 		>>> u.rel = 1.2
 		'''
-
-		rel = 1.
-		for unit, power in self.__units.items():
-			rel *= unit.rel ** power
-		return rel
+		return self.__rel
 
 	def basis(self):
 		'''
@@ -960,9 +1368,9 @@ class Units(UnicodeMixin):
 		'''
 		dimensionString = ""
 		dimensionMap = self.__dispenser.basis()
-		dimensions = self.dimensions
+		dimensions = self.__dimensions
 
-		for dimension in self.dimensions:
+		for dimension in dimensions:
 			if dimensions[dimension] != 0:
 				dimensionString += "*%s^%f" % (dimensionMap[dimension].abbr if dimensionMap[dimension].abbr is not None else dimensionMap[dimension], float(dimensions[dimension]))
 
@@ -1034,9 +1442,150 @@ class Units(UnicodeMixin):
 		return self.__new(new_units)
 
 	def __eq__(self, other):
-		if str(self) == str(other):
+		if self is other:
 			return True
-		return False
+		if isinstance(other, Units):
+			# Units are interned per dispenser, so only units drawn from different
+			# dispensers (or redefined Unit objects) can be equal without being identical.
+			return self.__hash == other.__hash and self.__str == other.__str
+		return self.__str == (other if isinstance(other, str_types) else str(other))
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
 
 	def __hash__(self):
 		return self.__hash
+
+
+############# UNITS PARSING ####################################################
+
+_UNITS_NAME = re.compile(r"[^*/^()0-9.+\-][^*/^()]*")
+_UNITS_NUMBER = re.compile(r"(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][-+]?[0-9]+)?")
+_UNITS_POWER = re.compile(r"\^(?:(-?(?:[0-9]+\.?[0-9]*|\.[0-9]+))|\((-?[0-9]+)(?:/([0-9]+))?\))")
+
+# Dimensionless Unit objects representing numeric factors in units strings, by value.
+_FACTOR_UNITS = {}
+
+def _dimensions_key(dimensions):
+	'''
+	Returns a canonical hashable representation of a dictionary of dimensions.
+	'''
+	return tuple(sorted((dimension, power) for dimension, power in dimensions.items() if power != 0))
+
+def _base_unit_signature(units):
+	'''
+	Returns the sorted names of the base units of the Unit objects in `units`.
+	'''
+	return tuple(sorted(unit.base_unit.name for unit in units.units))
+
+def _normalise_power(power):
+	'''
+	Returns `power` as an int if it is integral, and as a Fraction if it is the
+	float nearest to a fraction with a small denominator; so that equal powers
+	of units are represented (and rendered) identically.
+	'''
+	# Types are compared directly, since `isinstance` checks against Fraction (an
+	# abstract base class) are slow.
+	t = type(power)
+	if t is int:
+		return power
+	if t is float:
+		if power.is_integer():
+			return int(power)
+		try:
+			return _NORMALISED_POWERS[power]
+		except KeyError:
+			pass
+		fraction = Fraction(power).limit_denominator(_POWER_DENOMINATOR)
+		normalised = fraction if float(fraction) == power else power
+		if len(_NORMALISED_POWERS) < _POWER_CACHE_CAPACITY:
+			_NORMALISED_POWERS[power] = normalised
+		return normalised
+	if t is Fraction and power.denominator == 1:
+		return int(power)
+	return power
+
+def _get_unit(unit, dispenser):
+	if dispenser is None:
+		raise errors.UnitInvalidError("Unknown unit: '%s'." % unit)
+	return dispenser.get(unit)
+
+def _factor_unit(factor):
+	try:
+		return _FACTOR_UNITS[factor]
+	except KeyError:
+		name = '%.15g' % factor
+		return _FACTOR_UNITS.setdefault(factor, Unit(name, abbr=name, rel=factor, prefixable=False))
+
+def _parse_units(units, dispenser):
+	'''
+	Parses a string representation of units (see :class:`Units`) into a dictionary
+	of Unit-power relationships, with units drawn from `dispenser`. Numeric
+	factors are collected into a single dimensionless :class:`Unit`.
+	'''
+	d = {}
+	if units == "units":
+		return d
+
+	string = units.replace(" ", "")
+	d, factor, pos = _parse_product(string, 0, dispenser)
+	if pos != len(string):
+		raise errors.UnitInvalidError("Unexpected '%s' at position %d of units '%s'." % (string[pos], pos, units))
+
+	for unit, power in list(d.items()):
+		if power == 0:
+			del d[unit]
+	if factor != 1:
+		d[_factor_unit(factor)] = 1
+	return d
+
+def _parse_product(string, pos, dispenser):
+	d, factor = {}, 1.
+	if pos == len(string) or string[pos] == ')':
+		return d, factor, pos
+
+	# A leading operator (as in "/s") acts upon an implicit unity.
+	sign = 1
+	if string[pos] in '*/':
+		sign = -1 if string[pos] == '/' else 1
+		pos += 1
+
+	while True:
+		term, term_factor, pos = _parse_term(string, pos, dispenser)
+		for unit, power in term.items():
+			d[unit] = d.get(unit, 0) + sign * power
+		factor *= term_factor ** sign
+
+		if pos == len(string) or string[pos] not in '*/':
+			return d, factor, pos
+		sign = -1 if string[pos] == '/' else 1
+		pos += 1
+
+def _parse_term(string, pos, dispenser):
+	if string[pos:pos + 1] == '(':
+		d, factor, pos = _parse_product(string, pos + 1, dispenser)
+		if string[pos:pos + 1] != ')':
+			raise errors.UnitInvalidError("Unbalanced parentheses in units '%s'." % string)
+		pos += 1
+	else:
+		match = _UNITS_NUMBER.match(string, pos)
+		if match is not None:
+			d, factor = {}, float(match.group())
+		else:
+			match = _UNITS_NAME.match(string, pos)
+			if match is None:
+				raise errors.UnitInvalidError("Expected a unit at position %d of units '%s'." % (pos, string))
+			d, factor = {_get_unit(match.group(), dispenser): 1}, 1.
+		pos = match.end()
+
+	match = _UNITS_POWER.match(string, pos)
+	if match is not None:
+		if match.group(1) is not None:
+			power = Fraction(match.group(1))
+		else:
+			power = Fraction(int(match.group(2)), int(match.group(3) or 1))
+		d = dict((unit, p * power) for unit, p in d.items())
+		factor **= float(power)
+		pos = match.end()
+
+	return d, factor, pos
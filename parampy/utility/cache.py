@@ -0,0 +1,209 @@
+import numpy as np
+import threading
+
+
+class LRUCache(object):
+	'''
+	LRUCache(capacity=128)
+
+	A bounded mapping from hashable keys to values, which evicts the least
+	recently used entry whenever its capacity is exceeded. The number of hits,
+	misses and evictions is recorded, and is available via :func:`stats`.
+
+	:param capacity: The maximum number of entries to store.
+	:type capacity: int
+
+	>>> c = LRUCache(2)
+	>>> c.set('a', 1)
+	>>> c.get('a')
+	1
+	>>> c.get('b', 'missing')
+	'missing'
+	'''
+
+	def __init__(self, capacity=128):
+		self.__data = {}
+		self.__root = []  # Circular doubly linked list of [prev, next, key, value]
+		self.__root[:] = [self.__root, self.__root, None, None]
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self.capacity = capacity
+
+	@property
+	def capacity(self):
+		'''
+		The maximum number of entries stored by this cache. Reducing the capacity
+		evicts the least recently used entries as necessary.
+		'''
+		return self.__capacity
+	@capacity.setter
+	def capacity(self, capacity):
+		if capacity < 1:
+			raise ValueError("Cache capacity must be positive. Received: %s." % capacity)
+		self.__capacity = capacity
+		while len(self.__data) > capacity:
+			self.__evict()
+
+	def get(self, key, default=None):
+		'''
+		get(key, default=None)
+
+		:returns: The value associated with `key`, or `default` if the key is not present.
+		'''
+		link = self.__data.get(key)
+		if link is None:
+			self.misses += 1
+			return default
+		self.__touch(link)
+		self.hits += 1
+		return link[3]
+
+	def set(self, key, value):
+		'''
+		set(key, value)
+
+		Associates `value` with `key`, evicting the least recently used entry
+		if the cache is full.
+		'''
+		link = self.__data.get(key)
+		if link is not None:
+			link[3] = value
+			self.__touch(link)
+			return
+		root = self.__root
+		last = root[0]
+		link = [last, root, key, value]
+		last[1] = root[0] = self.__data[key] = link
+		if len(self.__data) > self.__capacity:
+			self.__evict()
+
+	def __touch(self, link):
+		prev, next = link[0], link[1]
+		prev[1] = next
+		next[0] = prev
+		root = self.__root
+		last = root[0]
+		last[1] = root[0] = link
+		link[0] = last
+		link[1] = root
+
+	def __evict(self):
+		root = self.__root
+		oldest = root[1]
+		root[1] = oldest[1]
+		oldest[1][0] = root
+		del self.__data[oldest[2]]
+		self.evictions += 1
+
+	def clear(self):
+		'''
+		clear()
+
+		Removes all entries from the cache. Statistics are preserved.
+		'''
+		self.__data.clear()
+		self.__root[:] = [self.__root, self.__root, None, None]
+
+	def stats(self):
+		'''
+		stats()
+
+		:returns: A dictionary with the number of `hits`, `misses` and `evictions`, along with the current `size` and `capacity` of the cache.
+		'''
+		return {
+			'hits': self.hits,
+			'misses': self.misses,
+			'evictions': self.evictions,
+			'size': len(self.__data),
+			'capacity': self.__capacity,
+		}
+
+	def __len__(self):
+		return len(self.__data)
+
+	def __contains__(self, key):
+		return key in self.__data
+
+
+class LockedLRUCache(LRUCache):
+	'''
+	LockedLRUCache(capacity=128)
+
+	A thread-safe :class:`LRUCache`, each operation of which holds a lock, so
+	that the cache can be shared between threads.
+	'''
+
+	def __init__(self, capacity=128):
+		self.__lock = threading.Lock()
+		LRUCache.__init__(self, capacity)
+
+	@property
+	def capacity(self):
+		return LRUCache.capacity.fget(self)
+	@capacity.setter
+	def capacity(self, capacity):
+		with self.__lock:
+			LRUCache.capacity.fset(self, capacity)
+
+	def get(self, key, default=None):
+		with self.__lock:
+			return LRUCache.get(self, key, default)
+
+	def set(self, key, value):
+		with self.__lock:
+			LRUCache.set(self, key, value)
+
+	def clear(self):
+		with self.__lock:
+			LRUCache.clear(self)
+
+	def stats(self):
+		with self.__lock:
+			return LRUCache.stats(self)
+
+
+class ArrayKey(object):
+	'''
+	ArrayKey(array)
+
+	A hashable wrapper around a numpy array, for use in cache keys. The hash is
+	computed from the shape, dtype and a bounded sample of the elements of the
+	array, so that hashing is cheap even for large arrays; whereas equality is
+	exact. Use :func:`freeze_key` to take a private copy of the array before
+	storing the key.
+	'''
+
+	__slots__ = ('array', 'hash')
+
+	def __init__(self, array):
+		self.array = array
+		flat = array.ravel()
+		if flat.size > 64:
+			flat = np.append(flat[::flat.size // 64 + 1], flat[-1])
+		self.hash = hash((array.shape, array.dtype.str, flat.tobytes()))
+
+	def __hash__(self):
+		return self.hash
+
+	def __eq__(self, other):
+		return isinstance(other, ArrayKey) and self.hash == other.hash and self.array.shape == other.array.shape and np.array_equal(self.array, other.array)
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+
+def freeze_key(key):
+	'''
+	freeze_key(key)
+
+	Replaces the arrays referenced by any :class:`ArrayKey` instances in (the
+	possibly nested tuple) `key` with private copies, so that subsequent in-place
+	modification of the original arrays does not corrupt the cache.
+	'''
+	if isinstance(key, ArrayKey):
+		key.array = key.array.copy()
+	elif isinstance(key, tuple):
+		for k in key:
+			freeze_key(k)
+	return key
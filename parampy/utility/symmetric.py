@@ -150,7 +150,7 @@ class AsyncParallelMap(ParallelMap):
 		self.spawnonce = spawnonce
 
 	def _reset(self):
-		self.q_in = multiprocessing.Queue(1 if not spawnonce else self.nprocs)
+		self.q_in = multiprocessing.Queue(1 if not self.spawnonce else self.nprocs)
 		self.q_out = multiprocessing.Queue()
 
 		while len(self.proc) > 0:
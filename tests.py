@@ -1,7 +1,5 @@
 from __future__ import print_function
 
-import timeit
-import cProfile as profile
 import math
 import numpy as np
 
@@ -29,6 +27,155 @@ class TestUnitsDispenser(unittest.TestCase):
 		self.assertEqual(str(self.ud('kg^2/s')),'kg^2/s')
 		self.assertEqual(self.ud('kg^2/s*m'), self.ud('m/s*kg^2'))
 
+	def test_interning(self):
+		units = self.ud('kg^2/s*m')
+		self.assertIs(units, self.ud('m/s*kg^2'))
+		self.assertIs(units, Units({'kg': 2, 's': -1, 'm': 1}, dispenser=self.ud))
+		self.assertIs(units, self.ud('kg^2')*self.ud('m')/self.ud('s'))
+		self.assertIs(self.ud('m')**2, self.ud('m^2'))
+		self.assertIs(self.ud('m/m'), self.ud(''))
+		self.assertEqual(hash(units), hash(self.ud('m/s*kg^2')))
+		self.assertEqual(units, SIUnitDispenser()('kg^2*m/s'))
+		self.assertNotEqual(units, self.ud('kg^2*m'))
+
+		# Equal powers are represented identically, however they were created
+		self.assertIs(self.ud('m')**0.5, self.ud('m^(1/2)'))
+		self.assertEqual(str(self.ud('m')**0.5), 'm^(1/2)')
+		self.assertIs(self.ud('m')**(1/3.), self.ud('m^(1/3)'))
+		self.assertEqual(str(self.ud('m')**2.), 'm^2')
+
+		# Units are only interned while they are referenced (or recently created)
+		import gc, weakref
+		ref = weakref.ref(self.ud('m')**0.1234567)
+		for i in range(1024):
+			self.ud('m')**(i + 3)
+		gc.collect()
+		self.assertIsNone(ref())
+		self.assertLessEqual(len(self.ud._registry), 1024)
+
+	def test_parse(self):
+		self.assertIs(self.ud('(kg*m)/(s^2)'), self.ud('kg*m/s^2'))
+		self.assertIs(self.ud('J/(kg*K)'), self.ud('J/kg/K'))
+		self.assertIs(self.ud('(m/s)^2'), self.ud('m^2/s^2'))
+		self.assertIs(self.ud('1/m'), self.ud('/m'))
+		self.assertIs(self.ud('m^(1/2)'), self.ud('m^0.5'))
+		self.assertIs(self.ud(str(self.ud('m^(1/2)'))), self.ud('m^0.5'))
+		self.assertEqual(SIQuantity(1, '1000*m')('km').value, 1)
+		self.assertEqual(SIQuantity(1, '10^3*m/s')('km/s').value, 1)
+		for units in ('m*', '(m', 'm)', 'm^'):
+			self.assertRaises(errors.UnitInvalidError, self.ud, units)
+
+	def test_parse_cache(self):
+		units = self.ud('kg*m/s^2')
+		self.ud.set_context('cm')
+		self.assertIs(self.ud._UnitDispenser__parsed['kg*m/s^2'], units)
+		for i in range(2000):
+			self.ud('m^%d' % i)
+			self.ud('kg*m/s^2')
+		self.assertLessEqual(len(self.ud._UnitDispenser__parsed) + len(self.ud._UnitDispenser__parsed_previous), 1024)
+		self.assertIs(self.ud('kg*m/s^2'), units)
+
+	def test_conversion_table(self):
+		self.ud.conversion_stats(reset=True)
+		self.assertAlmostEqual(self.ud('km/hour').scale(self.ud('m/s')), 1/3.6)
+		self.assertAlmostEqual(self.ud('km/hour').scale('m/s'), 1/3.6)
+		self.assertEqual(self.ud.conversion_stats(), {'hits': 1, 'misses': 1, 'size': 1})
+
+		# Equal units drawn from other dispensers do not share conversion factors
+		other = SIUnitDispenser()
+		other.add(Unit('hour', 'hour', 7200.).set_dimensions(time=1))
+		self.assertEqual(self.ud('km/hour').scale(self.ud('km/hour')), 1)
+		self.assertAlmostEqual(self.ud('km/hour').scale(other('km/hour')), 2)
+		self.ud.conversion_stats(reset=True)
+
+		self.assertRaises(errors.UnitConversionError, self.ud('J').scale, self.ud('Hz'))
+		self.ud.add_context('test', scale=2.)
+		self.ud.add_scaling(self.ud('J').dimensions, self.ud('Hz').dimensions, lambda scale: scale, context='test')
+		self.ud.set_context('test')
+		self.assertEqual(self.ud('J').scale(self.ud('Hz')), 2.)
+		self.ud.set_context('test', scale=3.)
+		self.assertEqual(self.ud('J').scale(self.ud('Hz')), 3.)
+		self.assertEqual(self.ud('J').scale(self.ud('Hz'), context='test'), 3.)
+
+		# Overrides apply only while a context is current
+		self.ud.set_context(None)
+		self.assertEqual(self.ud('J').scale(self.ud('Hz'), context='test'), 2.)
+
+	def test_scaling_graph(self):
+		hbar = 1.05457173e-34
+		self.assertAlmostEqual(self.ud('J').scale(self.ud('GHz'), context='cm') * 2 * math.pi * hbar, 1e-9)
+		self.assertAlmostEqual(self.ud('J').scale(self.ud('rad/s'), context='cm') * hbar, 1)
+		self.assertAlmostEqual(self.ud('rad/s').scale(self.ud('J'), context='cm') / hbar, 1)
+		self.assertRaises(errors.UnitConversionError, self.ud('J').scale, self.ud('rad/s'))
+		self.assertIn(((('length', 2), ('mass', 1), ('time', -2)), (('angle', 1), ('time', -1))), self.ud._scaling_table['cm'])
+
+		self.ud.set_context('cm', hbar=2 * hbar)
+		self.assertAlmostEqual(self.ud('J').scale(self.ud('rad/s'), context='cm') * hbar, 0.5)
+
+		self.ud.set_context(None)
+		self.assertAlmostEqual(self.ud.scale(self.ud('J').dimensions, self.ud('rad/s').dimensions, context='cm') * hbar, 1)
+
+	def test_prefixes(self):
+		self.assertIs(self.ud.get('km'), self.ud.get('kilometre'))
+		self.assertIs(self.ud.get('km'), self.ud.get('km'))
+		self.assertIs(self.ud.get('km').base_unit, self.ud.get('m'))
+		self.assertAlmostEqual(self.ud.get('km').rel, 1e3)
+		self.assertAlmostEqual(self.ud.get('{mu}s').rel, 1e-6)
+		self.assertIs(self.ud.get('min'), self.ud.get('minute'))
+		self.assertTrue(self.ud.has('GHz'))
+		self.assertFalse(self.ud.has('kilom'))
+		self.assertFalse(self.ud.has('kyear'))
+		self.assertIn('mm', self.ud.list())
+		self.assertRaises(errors.UnitInvalidError, self.ud.get, 'kkm')
+
+		self.ud.add(Unit('kilometre', 'km', 1e3, prefixable=False).set_dimensions(length=1))
+		self.assertIs(self.ud.get('km'), self.ud.get('kilometre'))
+		self.assertIsNot(self.ud.get('km').base_unit, self.ud.get('m'))
+
+	def test_shared_tables(self):
+		other = SIUnitDispenser()
+		self.assertIs(other._units, self.ud._units)
+		self.assertIs(other.get('km'), self.ud.get('km'))
+
+		self.ud.add(Unit('furlong', 'fur', 201.168).set_dimensions(length=1))
+		self.ud.basis(length='km')
+		self.ud.add_context('test', scale=2.)
+		self.assertTrue(self.ud.has('fur'))
+		self.assertFalse(other.has('fur'))
+		self.assertFalse(SIUnitDispenser().has('fur'))
+		self.assertEqual(str(other('m').basis()), 'm')
+		self.assertEqual(str(self.ud('m').basis()), 'km')
+		self.assertRaises(ValueError, other.set_context, 'test')
+
+		copied = self.ud.copy()
+		copied.add(Unit('chain', 'ch', 20.1168).set_dimensions(length=1))
+		self.assertTrue(copied.has('fur'))
+		self.assertFalse(self.ud.has('ch'))
+		self.assertEqual(copied('fur'), self.ud('fur'))
+
+		other.basis()['length'] = other.get('km')
+		self.assertEqual(str(SIUnitDispenser()('m').basis()), 'm')
+
+		class CustomDispenser(SIUnitDispenser):
+			def __init__(self, rel):
+				self.rel = rel
+				SIUnitDispenser.__init__(self)
+			def init_units(self):
+				SIUnitDispenser.init_units(self)
+				self.add(Unit('custom', 'cu', self.rel).set_dimensions(length=1))
+		self.assertEqual(CustomDispenser(2.)('cu').scale('m'), 2.)
+		self.assertEqual(CustomDispenser(3.)('cu').scale('m'), 3.)
+		self.assertFalse(SIUnitDispenser().has('cu'))
+
+	def test_dimension_vector(self):
+		self.assertEqual(self.ud('J').dimension_vector, self.ud('kg*m^2/s^2').dimension_vector)
+		self.assertNotEqual(self.ud('J').dimension_vector, self.ud('N').dimension_vector)
+		self.assertEqual(self.ud('m/m').dimension_vector, ())
+		self.assertEqual(self.ud('m^2/s').dimensions, {'length': 2, 'time': -1})
+		self.assertEqual((self.ud('m')**0.5).dimensions, {'length': 0.5})
+		self.assertAlmostEqual(self.ud('km/ms').rel, 1e6)
+		self.assertRaises(errors.UnitConversionError, self.ud('J').scale, self.ud('N'))
+
 class TestQuantity(unittest.TestCase):
 
 	def setUp(self):
@@ -69,6 +216,9 @@ class TestQuantity(unittest.TestCase):
 
 		self.assertRaises( errors.UnitConversionError, np.tan, SIQuantity(1,'m') )
 
+def double(x):
+	return 2*x
+
 class TestParameters(unittest.TestCase):
 
 	def setUp(self):
@@ -117,6 +267,60 @@ class TestParameters(unittest.TestCase):
 		self.p(x=2,y=lambda x: x+SIQuantity(1), z=lambda x,y: x+y)
 		self.assertEqual( self.p.z, SIQuantity(5.) )
 
+	def test_diamond(self):
+		calls = []
+		def a(x):
+			calls.append(x)
+			return x + 1
+		self.p(x=1)
+		self.p << {'a': a, 'b': lambda _a: 2*_a, 'c': lambda _a: 3*_a, 'd': lambda _b,_c: _b + _c}
+		self.assertEqual( self.p('_d'), 10 )
+		self.assertEqual( self.p('_d', x=2), 15 )
+		self.assertEqual( len(calls), 2 )
+
+		self.p << {'c': lambda _a: _a}
+		self.assertEqual( self.p('_d'), 6 )
+
+	def test_cache(self):
+		calls = []
+		def y(_x):
+			calls.append(_x)
+			return _x**2
+		self.p << {'y': y}
+		self.p.cache(y=2)
+		for x in [1, 2, 1, 2, 3, 1]:
+			self.assertEqual( self.p('_y', x=x), x**2 )
+		self.assertEqual( calls, [1, 2, 3, 1] )
+		self.assertEqual( self.p.cache('y'), {'hits': 2, 'misses': 4, 'evictions': 2, 'size': 2, 'capacity': 2} )
+
+		self.assertEqual( self.p('_y', x=np.array([1,2])).tolist(), [1,4] )
+		self.assertEqual( self.p('_y', x=np.array([1,2])).tolist(), [1,4] )
+		self.assertEqual( len(calls), 5 )
+
+		self.p.cache(y=False)
+		self.assertEqual( self.p.cache('y'), None )
+
+	def test_dependency_graph(self):
+		self.p(x=1, k=2)
+		self.p << {'y': lambda _x: 2*_x, 'z': lambda _y, _k: _y + _k}
+		self.assertEqual( self.p('_z'), 4 )
+		self.p.x = 2
+		self.assertEqual( self.p('_z'), 6 )
+		self.p << {'x': lambda _k: 3*_k}
+		self.assertEqual( self.p('_z'), 14 )
+		self.p << {'y': lambda _k: _k}
+		self.assertEqual( self.p('_z'), 4 )
+		self.p.forget('k')
+		self.assertRaises( errors.ParameterInvalidError, self.p, '_z' )
+		self.p.k = 1
+		self.assertEqual( self.p('_z'), 2 )
+
+	def test_scaling_cache(self):
+		self.p.x = (1,'m')
+		self.assertEqual( self.p._x, 1 )
+		self.p.scaling(length=(1,'nm'))
+		self.assertAlmostEqual( self.p._x / 1e9, 1 )
+
 	def test_scaling(self):
 		self.p.scaling(length=(1,'nm'), time=(2,'s'))
 		self.p(x=(1,"nm"))
@@ -134,6 +338,23 @@ class TestParameters(unittest.TestCase):
 
 		self.p('x','y','z')
 
+	def test_override_plans(self):
+		self.p << {'x':(2,'m'),'y':(3,'m'),'z':lambda x,y,z=None: x + y if z is None else (z - y, y)}
+		self.assertEqual( self.p('_x',z=(5,'m')), 2 )
+		self.assertEqual( self.p('_x',z=(6,'m')), 3 )
+		self.assertEqual( self.p('_y',y='2*_x'), 4 )
+		self.assertEqual( self.p('_y',x=3,y='2*_x'), 6 )
+		self.p.z = lambda x,y: x*y
+		self.assertEqual( self.p('_x',z=(6,'m')), 2 )
+
+		# Plans are shared by overrides with functions of the same arguments
+		plans = lambda: len([key for key in self.p._Parameters__cache_plans if key[0] == 'override'])
+		count = plans()
+		for i in range(1, 6):
+			self.assertEqual( self.p('_y',y=lambda _x: i*_x), 2*i )
+			self.assertEqual( self.p('_y',y='%d*_x' % i), 2*i )
+		self.assertLessEqual(plans(), count + 2)
+
 	def test_scaled(self):
 		self.p & {'x':'nm'}
 		self.p.scaling(length=(1,'nm'))
@@ -187,6 +408,68 @@ class TestParameters(unittest.TestCase):
 		self.assertEqual(self.p('x^2 + sqrt(y)^4', x=(1,'m'), y=(1,'m')),SIQuantity(2,'m^2'))
 		self.assertEqual(self.p('x + acos(y)', x=(1,'rad'), y=(0.2,'')),SIQuantity(2.369438406,'rad'))
 
+	def test_is_constant(self):
+		self.p << {'a0': lambda t: t, 'b0': 1}
+		for i in range(1, 40):  # Diamond-shaped dependencies, exponential without memoisation
+			self.p << {'a%d' % i: eval('lambda a%d, b%d: a%d + b%d' % ((i-1,)*4)), 'b%d' % i: eval('lambda a%d, b%d: a%d*b%d' % ((i-1,)*4))}
+		self.assertFalse(self.p.is_constant('a39', 't'))
+		self.assertTrue(self.p.is_constant('a39', 'x'))
+		self.assertTrue(self.p.is_constant('a39 + b39', 't', a0=1))
+		self.assertFalse(self.p.is_constant('b39', 't', a0=1, b0='t^2'))
+		self.assertFalse(self.p.is_constant('_a39', '_a20'))
+		self.assertTrue(self.p.is_function('a1'))
+		self.assertRaises(errors.ParameterInvalidError, self.p.is_constant, 'z', 't')
+
+	def test_specialise(self):
+		calls = []
+		def expensive(_x):
+			calls.append(_x)
+			return 10*_x
+		self.p << {'x':2, 'y':expensive, 'z':lambda _y,_t: _y*_t}
+		f = self.p.specialise('_z', 't')
+		self.assertEqual((f(1), f(2), f((3,''))), (20, 40, 60))
+		self.assertEqual(len(calls), 1)
+		self.assertEqual(self.p.specialise('_z', 't', x=1)(2), 20)
+		self.assertEqual(self.p.specialise('_y + _t', 't')(1), 21)
+
+		# Values are interpreted as overrides, just as they are by `p(param, **params)`
+		self.p << {'s': '2*_x', 'k': 3}
+		f = self.p.specialise('_s', 'x')
+		self.assertEqual(f('2'), 4)
+		self.assertEqual(f(lambda _k: _k + 1), 8)
+		self.assertEqual(f(lambda _k: _k + 1), self.p('_s', x=lambda _k: _k + 1))
+
+		# Bounds are checked just as they are by `p(param, **params)`
+		self.p << {'w': lambda _z: _z}
+		self.p.set_bounds({'w': (0, 30), 't': (0, 100)})
+		f = self.p.specialise('z', 't')
+		self.assertEqual(f(1).value, 20)
+		self.assertRaises(errors.ParameterOutsideBoundsError, f, 2)
+		self.assertRaises(errors.ParameterOutsideBoundsError, f, 200)
+
+	def test_compile(self):
+		self.p << {'x':2, 'k':(3,'m'), 'y':'_x*_t^2', 'z':lambda y,t: y + t, 'w':lambda _k: _k, 'v':'_y + _w'}
+		f = self.p.compile(['_y','z','v','x^2 + t'], wrt=['t'])
+		t = np.linspace(0,1,5)
+		for output, value in zip(f(t), [2*t**2, 2*t**2 + t, 2*t**2 + 3, 4 + t]):
+			self.assertTrue(np.allclose(output, value))
+		self.assertEqual(self.p.compile('y', wrt=['t'], x=3)(2.), 12)
+		self.assertEqual(self.p.compile('w', wrt=['k'])(2.), 2)
+
+		# Bounds are not checked by the generated function
+		self.p.set_bounds({'z': (0, 10)})
+		self.assertEqual(self.p.compile(['z'], wrt=['t'])(100.), (20100.,))
+
+	def test_expression_cache(self):
+		self.p.cache_expressions(capacity=1, clear=True)
+		for i in range(3):
+			self.assertEqual(self.p('_x^2 + _y^2', x=i, y=1), i**2 + 1)
+		self.assertEqual(self.p('_x*_y', x=2, y=3), 6)
+		stats = self.p.cache_expressions()
+		self.assertEqual((stats['size'], stats['evictions'], stats['capacity']), (1, 1, 1))
+		self.assertTrue(stats['hits'] >= 2)
+		self.assertEqual(self.p.cache_expressions(clear=True)['size'], 0)
+
 	def test_constants(self):
 		self.assertEqual(self.p._c_h,6.62606957e-34)
 		self.assertEqual(self.p.c_h,SIQuantity(6.62606957e-34,'J*s'))
@@ -216,6 +499,19 @@ class TestParameters(unittest.TestCase):
 		self.p.set_bounds({'y': [ (0, 1), (3,4) ]})
 		self.assertRaises(errors.ParameterOutsideBoundsError,self.p,'y')
 
+	def test_bounds_vectorised(self):
+		self.p.set_bounds({'x': [ (3,4), (0,1), (0.5,2) ]})
+		self.assertEqual( self.p.validate(x=np.array([-1,0,1.5,2.5,3,5])).tolist(), [False,True,True,False,True,False] )
+		self.p & {'x': 'J'}
+		self.assertEqual( self.p.validate(x=(np.array([1,2500]),'mJ'), y=np.array([1,2])).tolist(), [True,False] )
+		self.assertRaises(errors.UnitConversionError, self.p.validate, x=(np.array([1,2500]),'ms'))
+		self.assertEqual( self.p('_x',x=np.array([0.5,3.5])).tolist(), [0.5,3.5] )
+		self.assertRaises(errors.ParameterOutsideBoundsError,self.p,'_x',x=np.array([0.5,2.5]))
+
+		self.p.set_bounds({'z': (0,1)}, clip=True, error=False)
+		self.assertEqual( self.p('_z',z=np.array([-1,0.5,2])).tolist(), [0,0.5,1] )
+		self.assertEqual( self.p('_z',z=1.2), 1 )
+
 	def test_ranges(self):
 		self.assertEqual( self.p.range('_J_1',J_1=[0.1,0.2,0.4]), [0.1,0.2,0.4] )
 
@@ -228,6 +524,41 @@ class TestParameters(unittest.TestCase):
 		self.assertEqual( self.p.range('_z',z=(1,"2*_x",4),x=2), [1,2,3,4])
 		self.assertEqual( self.p.range('_z',z=((1,"m"),("2*_x","m"),4),x=2), [1,2,3,4])
 
+	def test_ranges_vectorised(self):
+		import math
+		self.p(x=1,k=2)
+		self.p << {'y':'_x^2', 'z': lambda _x,_k: math.sin(_x)*_k}
+		self.assertEqual( np.round(self.p.range_vectorised('_y',x=[0.1,0.2,0.3]),4).tolist(), [0.01,0.04,0.09] )
+		self.assertEqual( np.round(self.p.range_vectorised('_z',x=(0,math.pi/2,3)),4).tolist(), [0.,1.4142,2.] )
+		self.assertEqual( self.p.range_vectorised('_k',x=(0,1,3)).tolist(), [2,2,2] )
+
+		r = self.p.range_vectorised(['_y','_x^2 + _k'], x=[1,2], k=[0,1])
+		self.assertEqual( r['y'].tolist(), [1,4] )
+		self.assertEqual( r['x^2 + _k'].tolist(), [1,5] )
+
+		self.assertEqual( self.p.range_vectorised('y', x=[1,2])('').value.tolist(), [1,4] )
+		self.assertEqual( self.p.range_vectorised('_x',x=['_k','2*_k'],k=[1,3]), [1,6] )
+
+		# Genuine errors are raised, rather than causing element-wise re-evaluation
+		calls = []
+		def f(_x):
+			calls.append(_x)
+			raise KeyError(_x)
+		self.p << {'w': f}
+		self.assertRaises(KeyError, self.p.range_vectorised, '_w', x=[1,2])
+		self.assertEqual(len(calls), 1)
+
+		# Results of array evaluation which do not match element-wise evaluation are discarded
+		calls = []
+		def g(_x):
+			calls.append(_x)
+			return float(np.sum(_x))
+		self.p << {'v': g, 'u': lambda _x: np.array([_x, _x])}
+		self.assertEqual( self.p.range_vectorised('_v', x=[1,2,3]).tolist(), [1,2,3] )
+		self.assertEqual( len(calls), 4 )
+		self.assertEqual( self.p.range_vectorised('_u', x=[1,2]).tolist(), [[1,1],[2,2]] )
+		self.assertEqual( self.p.range_vectorised('_u', x=[1,2]).tolist(), np.array(self.p.range('_u', x=[1,2])).tolist() )
+
 	def test_passthrough(self):
 		self.assertEqual( self.p(10.0), 10.0 )
 		self.assertEqual( self.p( (10,'m') ), SIQuantity(10.0,'m') )
@@ -251,6 +582,36 @@ class TestParameters(unittest.TestCase):
 
 		self.assertRaises(errors.ParameterRecursionError,recurse)
 
+	def test_bulk_set(self):
+		params = dict(('a%d' % i, eval('lambda a%d: a%d + 1' % (i + 1, i + 1))) for i in range(200))
+		params['a200'] = 1
+		self.p << params
+		self.assertEqual(self.p._a0, 201)
+
+		self.p.x = 1
+		try:
+			self.p << {'y': lambda z: z, 'z': lambda y: y, 'u': lambda v: v, 'v': lambda u: u, 'x': 2, 'w': 3}
+			self.fail("Recursion not detected.")
+		except errors.ParameterRecursionError as e:
+			self.assertTrue('{u, v}' in str(e) and '{y, z}' in str(e))
+		self.assertEqual(self.p._x, 1)
+		self.assertFalse('w' in self.p or 'y' in self.p)
+
+		with self.p:
+			self.p << {'x': 3, 'w': 4}
+			self.assertEqual(self.p._x, 3)
+		self.assertEqual(self.p._x, 1)
+		self.assertFalse('w' in self.p)
+
+		# Errors are raised with their original tracebacks
+		import sys, traceback
+		try:
+			self.p << {'x': 2, 'w': (1, 2, 3)}
+			self.fail("Invalid quantity not detected.")
+		except errors.QuantityCoercionError:
+			self.assertTrue('__get_quantity' in ''.join(traceback.format_tb(sys.exc_info()[2])))
+		self.assertEqual(self.p._x, 1)
+
 	def test_context(self):
 		self.p.x = 1
 		with self.p:
@@ -258,6 +619,163 @@ class TestParameters(unittest.TestCase):
 			self.assertEqual(self.p._x,2)
 		self.assertEqual(self.p._x,1)
 
+		with self.p:
+			self.p.set_bounds({'x': (0, 10)})
+		self.assertIs(self.p._Parameters__parameters_bounds, None)
+
+	def test_context_nested(self):
+		self.p.x = 1
+		self.p.y = lambda x: 2*x
+		self.p.scaling(length=(1,'nm'))
+		self.assertEqual(self.p._y,2)
+		with self.p:
+			self.p.x = 2
+			self.p.z = 3
+			with self.p:
+				self.p.y = lambda x: 3*x
+				self.p.forget('x')
+				self.p.scaling(length=(1,'m'))
+			self.assertEqual(self.p._y,4)
+			self.assertEqual(str(self.p.scaling('length').units),'nm')
+		self.assertEqual(self.p._y,2)
+		self.assertRaises(errors.ParameterInvalidError, self.p, 'z')
+
+	def test_copy(self):
+		self.p.x = (1,'m')
+		self.p.y = lambda x: 2*x
+		q = self.p.copy()
+		q.x = 2
+		self.assertEqual(q._y,4)
+		self.assertEqual(self.p._y,2)
+		self.p & {'x': 'cm'}
+		self.assertEqual(str(self.p.units('x')),'cm')
+		self.assertEqual(str(q.units('x')),'m')
+		self.assertEqual(self.p.x.value,100)
+
+		q.unit_add(name='widget', abbr='wg', rel=2.0, dimensions={'length': 1})
+		q.set_units_context('cm')
+		self.assertEqual(q.convert((1, 'm'), output='wg'), 0.5)
+		self.assertRaises(errors.UnitInvalidError, self.p.convert, (1, 'm'), output='wg')
+		self.assertEqual(self.p.units_context, None)
+
+	def test_freeze(self):
+		import threading
+		self.p.x = (1,'m')
+		self.p << {'y': lambda _x, _y=None: 2*_x if _y is None else _y/2, 'z': '_y + _k'}
+		self.p.k = 1
+		f = self.p.freeze()
+		self.assertRaises(errors.ParameterFrozenError, setattr, f, 'x', 2)
+		self.assertRaises(errors.ParameterFrozenError, f.scaling, length=(1,'nm'))
+		self.assertRaises(errors.ParameterFrozenError, f.cache, y=True)
+
+		self.p.x = 2
+		self.p & {'x': 'cm'}
+		self.assertEqual(f._z, 3)
+		self.assertEqual(str(f.units('x')), 'm')
+		self.p.unit_add(name='widget', abbr='wg', rel=2.0, dimensions={'length': 1})
+		self.p.set_units_context('cm')
+		self.assertRaises(errors.UnitInvalidError, f.convert, (1, 'm'), output='wg')
+		self.assertEqual(f.units_context, None)
+
+		failures = []
+		def query(offset):
+			for i in range(200):
+				x = offset + i
+				if f('_z', x=x) != 2*x + 1 or f('_x', y=2*x) != x:
+					failures.append(x)
+		threads = [threading.Thread(target=query, args=(1000*n,)) for n in range(8)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+		self.assertEqual(failures, [])
+
+		q = f.copy()
+		q.x = 3
+		self.assertEqual(q._z, 7)
+
+	def test_pickle(self):
+		import pickle
+		self.p + {'name': 'widget', 'abbr': 'wg', 'rel': 2.0, 'dimensions': {'length': 1}}
+		self.p.scaling(length=(1,'nm'))
+		self.p.x = (1,'wg')
+		self.p << {'y': ('2*x', 'm'), 'z': double}
+		self.p & {'t': 'ns'}
+		self.p.set_bounds({'x': (0, (10,'m'))})
+		self.p.cache(y=16)
+
+		q = pickle.loads(pickle.dumps(self.p, 2))
+		self.assertAlmostEqual(q._x / 1e9, 2)
+		self.assertAlmostEqual(q._y / 1e9, 4)
+		self.assertEqual(q('_z', x=4), 8)
+		self.assertEqual(str(q.units('t')), 'ns')
+		self.assertEqual(q.cache('y')['capacity'], 16)
+		self.assertRaises(errors.ParameterOutsideBoundsError, q, x=(20,'m'))
+
+		self.p.w = lambda x: x
+		try:
+			import cloudpickle
+		except ImportError:
+			self.assertRaises(errors.ParametersException, pickle.dumps, self.p, 2)
+
+	def test_pickle_dispenser(self):
+		import pickle
+		self.assertEqual(Parameters().__getstate__()['dispenser'][0], 'class')
+
+		ud = SIUnitDispenser()
+		ud.add_context('test', k=1)
+		ud.add_scaling({'length': 1}, {'time': 1}, 2., context='test')
+		ud.add_conversion_map('dB', 'm', double)
+		p = Parameters(dispenser=ud, default_scaled=False)
+		p.set_units_context('test')
+		p.t = Quantity(1, 'degC', absolute=True, dispenser=ud)
+
+		q = pickle.loads(pickle.dumps(p, 2))
+		self.assertTrue(q.t.absolute)
+		self.assertAlmostEqual(q.t('K').value, 274.15)
+		self.assertEqual(q.units_context[0], 'test')
+		self.assertEqual(q.convert((1,'m'), output='s'), 2.)
+		self.assertEqual(Quantity(3, 'dB', dispenser=q.t.dispenser)('m').value, 6)
+
+	def test_ranges_iterator(self):
+		p = Parameters()
+		p.y = lambda a, b: a*b
+		def f(params):
+			return p('y', **params)
+		for nprocs in (1, 2):
+			results = dict(p.ranges_iterator([{'a': (0, 1, 3)}, {'b': [1, 2]}], function=f, nprocs=nprocs, progress=False))
+			self.assertEqual(results, {(0, 0): 0, (0, 1): 0, (1, 0): 0.5, (1, 1): 1, (2, 0): 1, (2, 1): 2})
+
+	def test_stats(self):
+		self.p << {'x': (1,'ms'), 'y': lambda x: 2*x, 'z': lambda _y, z=None: _y**2 if z is None else (z**0.5,)}
+		self.p.set_bounds({'x': (0, (10,'s'))})
+		self.p.cache(y=True)
+		self.p('_z')
+		self.assertEqual(self.p.stats(), {})
+
+		self.p.stats(enabled=True)
+		for i in range(10):
+			self.p('_z', x=(i % 5,'ms'))
+		self.p('_x', z=4)
+		stats = self.p.stats(enabled=False)
+		self.assertEqual(stats['z']['evaluations'], 11)
+		self.assertEqual(stats['z']['overrides'], 1)
+		self.assertEqual(stats['x']['overrides'], 10)
+		self.assertEqual(stats['y']['cache_misses'], 4) # x=1ms was cached before collection was enabled
+		self.assertEqual(stats['y']['evaluations'], 4) # Cache hits are not evaluations
+		self.assertEqual(stats['w']['evaluations'], 0)
+		self.assertFalse('w' in stats)
+		self.assertTrue(stats['x']['bounds_checks'] > 0)
+		self.assertTrue('Parameter' in str(stats))
+
+		self.p('_z')
+		self.assertEqual(self.p.stats()['z']['evaluations'], 11)
+		with self.p.profile() as scoped:
+			self.p('_z')
+		self.assertEqual(scoped['z']['evaluations'], 1)
+		self.assertEqual(self.p.stats()['z']['evaluations'], 11)
+		self.assertEqual(self.p.stats(reset=True), {})
+
 	def test_complex(self):
 		self.p.x = 1 + 2j
 
@@ -285,75 +803,61 @@ class TestParameters(unittest.TestCase):
 		self.assertEqual(p.z, 2)
 		self.assertEqual(str(p.units('t')),'ns')
 
+	def test_loadsave_profile(self):
+		import os, shutil, tempfile
+		directory = tempfile.mkdtemp()
+		try:
+			filename = os.path.join(directory, 'profile.json')
+			self.p + {'name': 'widget', 'abbr': 'wg', 'rel': 2.0, 'dimensions': {'length': 1}}
+			self.p.scaling(length=(1,'nm'))
+			self.p.a = (np.linspace(0, 1, 1000), 'm')
+			self.p.b = ([1, 2, 3], 'wg')
+			self.p.c = (1+2j, 'J')
+			self.p.d = ('2*a', 'm')
+			self.p.e = lambda a: a
+			self.p.cache(d=16)
+			self.p >> filename
+			self.assertTrue(os.path.exists(filename + '.a.npy'))
+
+			p = Parameters.load(filename, default_scaled=False)
+			self.assertTrue(isinstance(p.a.value, np.memmap))
+			self.assertTrue(np.allclose(p._a, np.linspace(0, 1e9, 1000)))
+			self.assertTrue(np.allclose(p.b.value, [1, 2, 3]))
+			self.assertEqual(str(p.units('b')), 'wg')
+			self.assertEqual(p.c.value, 1+2j)
+			self.assertTrue(np.allclose(p._d, 2*np.linspace(0, 1e9, 1000)))
+			self.assertEqual(p.cache('d')['capacity'], 16)
+			self.assertFalse('e' in p)
+
+			# Saving over the sidecars from which arrays are mapped
+			p.f = np.array([1, 2.5], dtype=object)
+			p >> filename
+			self.assertTrue(np.allclose(p._a, np.linspace(0, 1e9, 1000)))
+			p = Parameters.load(filename, default_scaled=False)
+			self.assertTrue(np.allclose(p._a, np.linspace(0, 1e9, 1000)))
+			self.assertEqual(list(p.f.value), [1, 2.5])
+			self.assertFalse(os.path.exists(filename + '.f.npy'))
+
+			p.forget('a')
+			p >> filename
+			self.assertFalse(os.path.exists(filename + '.a.npy'))
+		finally:
+			shutil.rmtree(directory)
+
 	def test_dictmode(self):
 		self.p.z = 1
 		self.assertEqual(type(self.p(['z'])), dict)
 		self.assertEqual(type(self.p.range(['z'],z=[0,1,2])), dict)
 
 
-if __name__ == '__main__':
+class TestImport(unittest.TestCase):
 
-	print("\n\n")
-	print("Unit Tests")
-	print("-----------------")
-	unittest.main(exit=False)
-
-
-	print("Performance Tests")
-	print("-----------------")
-	print()
-	x = 1e23
-	p=Parameters()
-	p(x=x,y=2,z=3,a=1,b=2,c=3,d=2)
-	q = {'x':x}
-	#p['x'] = (0,1e24)
-
-	def timer(name,baseline,*tests):
-		print(" - Speed tests for %s" % name)
-		time_base = timeit.timeit("%s()"%baseline.__name__,setup="from __main__ import %s"%baseline.__name__,number=100000)
-		for test in tests:
-			time = timeit.timeit("%s()"%test.__name__,setup="from __main__ import %s"%test.__name__,number=100000)
-			print("\t%s: \t%.2fx slower than baseline" % (test.__name__,time/time_base))
-
-	def test_baseline():
-		return q['x']
-
-	def test_extract():
-		return p('x')
-
-	def test_attr():
-		return p.x
-
-	def test_override():
-		return p('x',x=1)
-
-	def test_overrides():
-		return p('x',x=1,y=2,z=3,a=1,b=2,c=3,d=2)
-
-	timer("Parameter Extraction", test_baseline, test_extract, test_attr, test_override, test_overrides)
-
-	def square(x):
-		return x**2
-	p.y = lambda x: x**2
-	p.y2 = 'x^2'
-	o = p.optimise('x^2')
-	def test_baseline2():
-		return square(q['x'])
-	def test_arg_fn():
-		return p(o)
-	def test_param_fn():
-		return p('y')
-	def test_param_fn_sympy():
-		return p('y2')
-	def test_param_fn_override():
-		return p('y',x=10)
-
-	timer("Functional Parameters", test_baseline2, test_arg_fn, test_param_fn, test_param_fn_sympy, test_param_fn_override)
-
-	p.bounds(x = (0,10))
-	def test_bounds_fn():
-		return p(x=5)
-	def test_bounds():
-		return p('y',x=5)
-
-	timer("Bounds", test_baseline2, test_bounds_fn, test_bounds)
+	def test_import_lazy(self):
+		# SymPy should only be imported once symbolic expressions are used
+		import subprocess, sys
+		output = subprocess.check_output([sys.executable, '-c', "import sys; import parampy; p = parampy.Parameters(); p.x = (1, 'ms'); p._x; print('sympy' in sys.modules)"])
+		self.assertEqual(output.strip(), b'False')
+
+
+if __name__ == '__main__':
+	unittest.main()